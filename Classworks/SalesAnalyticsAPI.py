@@ -1,27 +1,111 @@
 import uvicorn
-from fastapi import FastAPI, Depends, HTTPException, status
-from sqlalchemy import create_engine, Column, Integer, String, Float, Date
+from fastapi import FastAPI, Depends, HTTPException, Header, Query, Request, status
+from fastapi.concurrency import run_in_threadpool
+from fastapi.routing import APIRoute
+from sqlalchemy import create_engine, event, Column, Integer, String, Float, Date, Boolean, LargeBinary, Index, and_, func, literal, select, insert, update, delete, text
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 from sqlalchemy.orm import sessionmaker, Session, declarative_base
 from pydantic import BaseModel, ConfigDict
-from typing import List, Literal
-import pandas as pd
+from typing import Dict, List, Literal, Optional, Union
 import datetime
 import os
 from contextlib import asynccontextmanager
 import io
-import matplotlib
-
-matplotlib.use('Agg')
-import matplotlib.pyplot as plt
-from fastapi.responses import Response
+import hashlib
+import csv
+import codecs
+import json
+import base64
+import threading
+import asyncio
+import bisect
+import functools
+import inspect
+import argparse
+from collections import OrderedDict
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import PlainTextResponse, Response, StreamingResponse
+
+from plot_renderer import (DAILY_METRICS, PlotRenderPool, RenderPoolSaturated, RenderTimeout, RenderWorkerCrashed,
+                           downsample_rows, series_values, use_as_worker_main)
+from sales_sketches import KLLSketch, HyperLogLog
+from sales_metrics import MetricsMiddleware, MetricsRegistry
+from sales_shared_cache import SharedCacheFile, SharedDataVersion, SharedResultCache
+from sales_group_commit import CommittedFlushError, GroupCommitter
 
 DATABASE_URL = "sqlite:///./sales.db"
+ASYNC_DATABASE_URL = "sqlite+aiosqlite:///./sales.db"
+# "sync" serves CRUD and analytics from Starlette's threadpool, "async" from the event loop via aiosqlite.
+# Async mode is slower under load, since handler bodies run on the event-loop thread (see install_async_endpoints).
+DB_MODE = os.environ.get("SALES_DB_MODE", "sync")
+DB_POOL_SIZE = int(os.environ.get("SALES_DB_POOL_SIZE", 10))
+DB_MAX_OVERFLOW = int(os.environ.get("SALES_DB_MAX_OVERFLOW", 20))
+SQLITE_CACHE_KIB = int(os.environ.get("SALES_SQLITE_CACHE_KIB", 64 * 1024))
 CSV_FILE = "sales_data.csv"
+PLOT_CACHE_SIZE = 32
+# Daily plots are thinned to at most this many points unless the request asks for another max_points.
+PLOT_MAX_POINTS = 1000
+PLOT_MEDIA_TYPES = {"png": "image/png", "svg": "image/svg+xml", "json": "application/json"}
+# Number of uvicorn worker processes started by `python SalesAnalyticsAPI.py` (or its --workers flag).
+WORKERS = int(os.environ.get("SALES_WORKERS", 1))
+# Keep the data version and cached analytics/plots in SHARED_CACHE_FILE so all workers share them. On by default
+# whenever more than one worker runs.
+SHARED_CACHE_ENABLED = os.environ.get("SALES_SHARED_CACHE", "1" if WORKERS > 1 else "0") == "1"
+SHARED_CACHE_FILE = "sales_cache.db"
+SHARED_CACHE_SIZE = 256
+# Set by the launcher after it has seeded the database once, so workers do not all seed it concurrently.
+SKIP_SEED = os.environ.get("SALES_SKIP_SEED", "0") == "1"
+BULK_BATCH_SIZE = 5000
+BULK_MAX_REPORTED_ERRORS = 1000
+EXPORT_CHUNK_SIZE = 10_000
+SEED_CHUNK_SIZE = 50_000
+# Rows per multi-row INSERT; 5 columns each keeps us under the 999 bound parameters older SQLite builds allow.
+SEED_INSERT_ROWS = 199
+SEED_DTYPES = {"product": "string", "category": "string", "quantity": "Int64", "price": "float64", "date": "string"}
+PLOT_RENDER_WORKERS = int(os.environ.get("PLOT_RENDER_WORKERS", min(4, os.cpu_count() or 1)))
+PLOT_RENDER_MAX_PENDING = int(os.environ.get("PLOT_RENDER_MAX_PENDING", PLOT_RENDER_WORKERS * 4))
+PLOT_RENDER_TIMEOUT = float(os.environ.get("PLOT_RENDER_TIMEOUT", 10))
+# pandas and matplotlib load on first use; set SALES_WARMUP=1 to pay that cost in the background at startup.
+WARMUP_ENABLED = os.environ.get("SALES_WARMUP", "0") == "1"
+# Coalesce concurrent POST /sales/ requests into one transaction per group of up to GROUP_COMMIT_MAX_ROWS rows,
+# waiting at most GROUP_COMMIT_MAX_DELAY_MS for a group to fill. Each request still answers after its group commits.
+GROUP_COMMIT_ENABLED = os.environ.get("SALES_GROUP_COMMIT", "0") == "1"
+GROUP_COMMIT_MAX_DELAY_MS = float(os.environ.get("SALES_GROUP_COMMIT_MAX_DELAY_MS", 2))
+GROUP_COMMIT_MAX_ROWS = int(os.environ.get("SALES_GROUP_COMMIT_MAX_ROWS", 500))
+# Request latency histograms and per-stage analytics timers, exposed at /metrics; SALES_METRICS=0 turns them off.
+METRICS_ENABLED = os.environ.get("SALES_METRICS", "1") == "1"
 
 engine = create_engine(
-    DATABASE_URL, connect_args={"check_same_thread": False}
+    DATABASE_URL,
+    connect_args={"check_same_thread": False},
+    pool_size=DB_POOL_SIZE,
+    max_overflow=DB_MAX_OVERFLOW
 )
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+
+def configure_sqlite_connection(dbapi_connection, connection_record):
+    """WAL lets readers run alongside the writer; NORMAL sync is still crash-safe under WAL."""
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA journal_mode=WAL")
+    cursor.execute("PRAGMA synchronous=NORMAL")
+    cursor.execute(f"PRAGMA cache_size=-{SQLITE_CACHE_KIB}")
+    cursor.execute("PRAGMA temp_store=MEMORY")
+    cursor.close()
+
+
+event.listen(engine, "connect", configure_sqlite_connection)
+
+if DB_MODE == "async":
+    from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+    async_engine = create_async_engine(
+        ASYNC_DATABASE_URL,
+        pool_size=DB_POOL_SIZE,
+        max_overflow=DB_MAX_OVERFLOW
+    )
+    AsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+    event.listen(async_engine.sync_engine, "connect", configure_sqlite_connection)
 Base = declarative_base()
 
 
@@ -30,11 +114,71 @@ class SaleDB(Base):
 
     id = Column(Integer, primary_key=True, index=True)
     product = Column(String, index=True)
-    category = Column(String, index=True)
+    category = Column(String)
     quantity = Column(Integer)
     price = Column(Float)
     date = Column(Date)
 
+    # Covering indexes for date-range analytics, so range scans never visit the table rows. The category-first
+    # one lets SQLite use both the category equality and the date range, and also serves category-only lookups,
+    # so category has no single-column index of its own.
+    __table_args__ = (
+        Index("ix_sales_date_category", "date", "category", "quantity", "price"),
+        Index("ix_sales_category_date", "category", "date", "quantity", "price"),
+    )
+
+
+class SalesDailyRollupDB(Base):
+    __tablename__ = "sales_daily_rollup"
+
+    date = Column(Date, primary_key=True)
+    revenue = Column(Float, nullable=False, default=0)
+    quantity = Column(Integer, nullable=False, default=0)
+    orders = Column(Integer, nullable=False, default=0)
+
+
+class SalesCategoryRollupDB(Base):
+    __tablename__ = "sales_category_rollup"
+
+    category = Column(String, primary_key=True)
+    revenue = Column(Float, nullable=False, default=0)
+    quantity = Column(Integer, nullable=False, default=0)
+    orders = Column(Integer, nullable=False, default=0)
+
+
+class SeedProgressDB(Base):
+    __tablename__ = "seed_progress"
+
+    source = Column(String, primary_key=True)
+    rows_committed = Column(Integer, nullable=False, default=0)
+    completed = Column(Boolean, nullable=False, default=False)
+
+
+class SalesTotalRollupDB(Base):
+    """A single row of totals over every sale, including the ones without a date or category."""
+    __tablename__ = "sales_total_rollup"
+
+    scope = Column(String, primary_key=True)
+    revenue = Column(Float, nullable=False, default=0)
+    quantity = Column(Integer, nullable=False, default=0)
+    orders = Column(Integer, nullable=False, default=0)
+
+
+# The value of the "scope" rollup key for every sale.
+ALL_SALES = "all"
+ROLLUPS = ((SalesDailyRollupDB, "date"), (SalesCategoryRollupDB, "category"), (SalesTotalRollupDB, "scope"))
+
+
+class SalesSketchDB(Base):
+    """Serialized order-value quantile and distinct-product sketches for one (day, category) cell."""
+    __tablename__ = "sales_sketches"
+
+    date = Column(Date, primary_key=True)
+    category = Column(String, primary_key=True)
+    orders = Column(Integer, nullable=False, default=0)
+    order_values = Column(LargeBinary, nullable=False)
+    products = Column(LargeBinary, nullable=False)
+
 
 class SaleBase(BaseModel):
     product: str
@@ -54,6 +198,11 @@ class Sale(SaleBase):
     model_config = ConfigDict(from_attributes=True)
 
 
+class SalePage(BaseModel):
+    items: List[Sale]
+    next_cursor: Optional[str]
+
+
 class AnalyticsSummary(BaseModel):
     total_revenue: float
     total_items_sold: int
@@ -62,24 +211,480 @@ class AnalyticsSummary(BaseModel):
     revenue_by_category: dict
 
 
+class TimeseriesPoint(BaseModel):
+    bucket: datetime.date
+    total_revenue: float
+    total_items_sold: int
+    total_orders: int
+    average_order_value: float
+
+
+class Timeseries(BaseModel):
+    bucket: str
+    start: Optional[datetime.date]
+    end: Optional[datetime.date]
+    category: Optional[str]
+    points: List[TimeseriesPoint]
+
+
+class Distribution(BaseModel):
+    orders: int
+    median_order_value: Optional[float]
+    p90_order_value: Optional[float]
+    p95_order_value: Optional[float]
+    p99_order_value: Optional[float]
+    distinct_products: int
+    distinct_products_by_category: Dict[str, int]
+
+
 class MessageResponse(BaseModel):
     detail: str
 
 
+class BulkBatchResult(BaseModel):
+    batch: int
+    inserted: int
+
+
+class BulkRowError(BaseModel):
+    line: int
+    error: str
+
+
+class BulkIngestResult(BaseModel):
+    inserted: int
+    rejected: int
+    batches: List[BulkBatchResult]
+    errors: List[BulkRowError]
+
+
+class SaleSelection(BaseModel):
+    """Rows matching every given criterion; ids, category and the inclusive start/end dates combine with AND."""
+    ids: Optional[List[int]] = None
+    category: Optional[str] = None
+    start: Optional[datetime.date] = None
+    end: Optional[datetime.date] = None
+
+
+class SaleChanges(BaseModel):
+    product: Optional[str] = None
+    category: Optional[str] = None
+    quantity: Optional[int] = None
+    price: Optional[float] = None
+    date: Optional[datetime.date] = None
+
+
+class BulkUpdateRequest(SaleSelection):
+    changes: SaleChanges
+
+
+class BulkMutationResult(BaseModel):
+    affected: int
+
+
+class PlotCacheStats(BaseModel):
+    hits: int
+    misses: int
+    size: int
+    max_size: int
+    data_version: int
+
+
+class DataVersion:
+    """Monotonic counter bumped after every committed sale write; cached analytics are keyed by it."""
+
+    def __init__(self):
+        self._value = 0
+        self._lock = threading.Lock()
+
+    def current(self) -> int:
+        return self._value
+
+    def bump(self) -> int:
+        with self._lock:
+            self._value += 1
+            return self._value
+
+
+class PlotCache:
+    """Thread-safe LRU cache of rendered plots keyed by (metric, data version)."""
+
+    def __init__(self, max_size: int):
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self._items = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            value = self._items.get(key)
+            if value is None:
+                self.misses += 1
+                return None
+            self._items.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key, value):
+        with self._lock:
+            self._items[key] = value
+            self._items.move_to_end(key)
+            while len(self._items) > self.max_size:
+                self._items.popitem(last=False)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "size": len(self._items),
+                "max_size": self.max_size
+            }
+
+
+class AggregateSeries:
+    """Sorted (key, revenue, quantity, orders) rows for one rollup key, shared by every reader of that grouping.
+
+    Loaded once, then kept current by apply(): a write only patches the points for the dates or categories it
+    touched (bisect plus an in-place replace), so readers never rebuild the series. version records the data
+    version the series was loaded at, for the shared-cache mode where other processes write too.
+    """
+
+    def __init__(self):
+        self.loaded = False
+        self.version = None
+        self._keys = []
+        self._rows = []
+        self._lock = threading.Lock()
+
+    def load(self, rows: list, version: int = None):
+        with self._lock:
+            self._rows = [tuple(row) for row in rows]
+            self._keys = [row[0] for row in self._rows]
+            self.version = version
+            self.loaded = True
+
+    def reset(self):
+        with self._lock:
+            self._keys, self._rows = [], []
+            self.version = None
+            self.loaded = False
+
+    def rows(self) -> list:
+        with self._lock:
+            return list(self._rows)
+
+    def apply(self, deltas: dict, sign: int):
+        """Adds sign * (revenue, quantity, orders) per key, dropping points left with no orders."""
+        with self._lock:
+            if not self.loaded:
+                return
+            for key, (revenue, quantity, orders) in deltas.items():
+                index = bisect.bisect_left(self._keys, key)
+                if index < len(self._keys) and self._keys[index] == key:
+                    _, old_revenue, old_quantity, old_orders = self._rows[index]
+                    point = (key, old_revenue + sign * revenue, old_quantity + sign * quantity,
+                             old_orders + sign * orders)
+                    if point[3] > 0:
+                        self._rows[index] = point
+                    else:
+                        del self._keys[index], self._rows[index]
+                elif sign > 0:
+                    self._keys.insert(index, key)
+                    self._rows.insert(index, (key, revenue, quantity, orders))
+
+
+if SHARED_CACHE_ENABLED:
+    shared_cache_file = SharedCacheFile(SHARED_CACHE_FILE)
+    data_version = SharedDataVersion(shared_cache_file)
+    plot_cache = SharedResultCache(shared_cache_file, SHARED_CACHE_SIZE)
+else:
+    data_version = DataVersion()
+    plot_cache = PlotCache(PLOT_CACHE_SIZE)
+metrics = MetricsRegistry(METRICS_ENABLED)
+# Daily, per-category and overall aggregates behind the plots and the summary, keyed like ROLLUPS.
+aggregate_series = {"date": AggregateSeries(), "category": AggregateSeries(), "scope": AggregateSeries()}
+render_pool = PlotRenderPool(PLOT_RENDER_WORKERS, PLOT_RENDER_MAX_PENDING, PLOT_RENDER_TIMEOUT)
+group_committer = GroupCommitter(lambda sales: flush_sales_group(sales), GROUP_COMMIT_MAX_DELAY_MS / 1000,
+                                 GROUP_COMMIT_MAX_ROWS)
+
+
+def upsert_rollup_deltas(db: Session, model, key: str, deltas: dict, sign: int):
+    """Adds sign * (revenue, quantity, orders) to each rollup row in deltas, dropping rows left with no orders."""
+    for value, (revenue, quantity, orders) in deltas.items():
+        stmt = sqlite_insert(model).values({
+            key: value,
+            "revenue": sign * revenue,
+            "quantity": sign * quantity,
+            "orders": sign * orders
+        })
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[key],
+            set_={
+                "revenue": model.revenue + stmt.excluded.revenue,
+                "quantity": model.quantity + stmt.excluded.quantity,
+                "orders": model.orders + stmt.excluded.orders
+            }
+        )
+        db.execute(stmt)
+        if sign < 0:
+            db.query(model).filter(getattr(model, key) == value, model.orders <= 0).delete(
+                synchronize_session=False)
+
+
+def rollup_value(sale: dict, key: str):
+    return ALL_SALES if key == "scope" else sale[key]
+
+
+def rollup_column(key: str):
+    return literal(ALL_SALES) if key == "scope" else getattr(SaleDB, key)
+
+
+def apply_sales_to_rollups(db: Session, sales: List[dict], sign: int):
+    """Adds (sign=1) or removes (sign=-1) sales from the rollup tables, inside the caller's transaction.
+
+    Sales sharing a date or category are folded together first, so a batch costs one upsert per distinct key.
+    Returns the folded {key: {value: (revenue, quantity, orders)}} deltas for apply_series_changes.
+    """
+    changes = {}
+    for model, key in ROLLUPS:
+        deltas = {}
+        for sale in sales:
+            value = rollup_value(sale, key)
+            if value is None:
+                continue
+            quantity = sale["quantity"] or 0
+            revenue, total_quantity, orders = deltas.get(value, (0, 0, 0))
+            deltas[value] = (revenue + quantity * (sale["price"] or 0), total_quantity + quantity, orders + 1)
+        upsert_rollup_deltas(db, model, key, deltas, sign)
+        changes[key] = deltas
+    return changes
+
+
+def apply_matching_sales_to_rollups(db: Session, where, sign: int):
+    """Like apply_sales_to_rollups for every sale matching where, with the folding done by a GROUP BY in SQLite."""
+    changes = {}
+    for model, key in ROLLUPS:
+        column = rollup_column(key)
+        rows = db.execute(
+            select(
+                column,
+                func.coalesce(func.sum(SaleDB.quantity * SaleDB.price), 0),
+                func.coalesce(func.sum(SaleDB.quantity), 0),
+                func.count(SaleDB.id)
+            ).where(where, column.isnot(None)).group_by(column)
+        ).all()
+        changes[key] = {value: tuple(totals) for value, *totals in rows}
+        upsert_rollup_deltas(db, model, key, changes[key], sign)
+    return changes
+
+
+def begin_write(db: Session):
+    """Takes SQLite's write lock before the first read of a read-then-write.
+
+    pysqlite only opens a transaction at the first INSERT/UPDATE/DELETE, so SELECTs issued before it read whatever
+    is committed at that moment and another writer can slip in between them and the write.
+    """
+    db.execute(text("BEGIN IMMEDIATE"))
+
+
+def apply_sale_to_rollups(db: Session, sale: dict, sign: int) -> dict:
+    return apply_sales_to_rollups(db, [sale], sign)
+
+
+def apply_series_changes(changes: dict, sign: int):
+    """Patches the shared aggregate series with rollup deltas, once the write they came from has committed."""
+    if SHARED_CACHE_ENABLED:
+        # Writes from other workers never reach this process's series, so load_series reloads it instead.
+        return
+    for key, deltas in changes.items():
+        aggregate_series[key].apply(deltas, sign)
+
+
+def rebuild_rollups(conn):
+    """Recomputes the daily, category and total rollup tables from the raw sales rows."""
+    for model, key in ROLLUPS:
+        column = rollup_column(key)
+        conn.execute(delete(model))
+        conn.execute(insert(model).from_select(
+            [key, "revenue", "quantity", "orders"],
+            select(
+                column,
+                func.coalesce(func.sum(SaleDB.quantity * SaleDB.price), 0),
+                func.coalesce(func.sum(SaleDB.quantity), 0),
+                func.count(SaleDB.id)
+            ).where(column.isnot(None)).group_by(column)
+        ))
+
+
+def store_sketch_cell(db, cell: tuple, orders: int, order_values: KLLSketch, products: HyperLogLog):
+    stmt = sqlite_insert(SalesSketchDB).values(
+        date=cell[0],
+        category=cell[1],
+        orders=orders,
+        order_values=order_values.to_bytes(),
+        products=products.to_bytes()
+    )
+    db.execute(stmt.on_conflict_do_update(
+        index_elements=["date", "category"],
+        set_={
+            "orders": stmt.excluded.orders,
+            "order_values": stmt.excluded.order_values,
+            "products": stmt.excluded.products
+        }
+    ))
+
+
+def add_sales_to_sketches(db: Session, sales: List[dict]):
+    """Folds new sales into their (day, category) sketch cells, inside the caller's transaction."""
+    cells = {}
+    for sale in sales:
+        if sale["date"] is not None and sale["category"] is not None:
+            cells.setdefault((sale["date"], sale["category"]), []).append(sale)
+
+    for cell, cell_sales in cells.items():
+        stored = db.get(SalesSketchDB, cell)
+        if stored is None:
+            orders, order_values, products = 0, KLLSketch(), HyperLogLog()
+        else:
+            orders = stored.orders
+            order_values = KLLSketch.from_bytes(stored.order_values)
+            products = HyperLogLog.from_bytes(stored.products)
+        for sale in cell_sales:
+            order_values.add((sale["quantity"] or 0) * (sale["price"] or 0))
+            if sale["product"] is not None:
+                products.add(sale["product"])
+        store_sketch_cell(db, cell, orders + len(cell_sales), order_values, products)
+
+
+def rebuild_sketch_cells(db: Session, cells: set):
+    """Sketches cannot forget values, so cells touched by an update or delete are rebuilt from their rows.
+
+    Pending changes must be flushed first. A cell is one day of one category, read via ix_sales_category_date.
+    """
+    for cell in cells:
+        if None in cell:
+            continue
+        rows = db.query(SaleDB.quantity, SaleDB.price, SaleDB.product).filter(
+            SaleDB.date == cell[0], SaleDB.category == cell[1]
+        ).all()
+        if not rows:
+            db.query(SalesSketchDB).filter(
+                SalesSketchDB.date == cell[0], SalesSketchDB.category == cell[1]
+            ).delete(synchronize_session=False)
+            continue
+        order_values, products = KLLSketch(), HyperLogLog()
+        for quantity, price, product in rows:
+            order_values.add((quantity or 0) * (price or 0))
+            if product is not None:
+                products.add(product)
+        store_sketch_cell(db, cell, len(rows), order_values, products)
+
+
+def rebuild_sketches(conn):
+    """Recomputes every sketch cell in one ordered pass over the sales table."""
+    conn.execute(delete(SalesSketchDB))
+    result = conn.execution_options(stream_results=True, yield_per=10_000).execute(
+        select(SaleDB.category, SaleDB.date, SaleDB.quantity, SaleDB.price, SaleDB.product)
+        .where(SaleDB.category.isnot(None), SaleDB.date.isnot(None))
+        .order_by(SaleDB.category, SaleDB.date)
+    )
+    cell, orders, order_values, products = None, 0, None, None
+    for category, date, quantity, price, product in result:
+        if (date, category) != cell:
+            if cell is not None:
+                store_sketch_cell(conn, cell, orders, order_values, products)
+            cell, orders, order_values, products = (date, category), 0, KLLSketch(), HyperLogLog()
+        orders += 1
+        order_values.add((quantity or 0) * (price or 0))
+        if product is not None:
+            products.add(product)
+    if cell is not None:
+        store_sketch_cell(conn, cell, orders, order_values, products)
+
+
+def sale_values(db_sale: SaleDB) -> dict:
+    return {key: getattr(db_sale, key) for key in ("product", "category", "quantity", "price", "date")}
+
+
+def seed_from_csv(csv_file: str):
+    """Streams csv_file into the sales table in chunks of SEED_CHUNK_SIZE rows.
+
+    Each chunk commits together with its checkpoint in seed_progress, so a seed that is killed part-way
+    resumes after the last committed chunk on the next startup.
+    """
+    with engine.begin() as conn:
+        progress = conn.execute(
+            select(SeedProgressDB.rows_committed).where(SeedProgressDB.source == csv_file)
+        ).first()
+        if progress is None:
+            conn.execute(insert(SeedProgressDB).values(source=csv_file, rows_committed=0, completed=False))
+            rows_committed = 0
+        else:
+            rows_committed = progress.rows_committed
+            print(f"Resuming seed from {csv_file} after {rows_committed} rows...")
+
+    import pandas as pd
+
+    # The checkpoint counts parsed rows, not file lines (blank lines and quoted newlines make those differ),
+    # so the rows already committed are dropped after parsing rather than skipped with skiprows.
+    rows_to_skip = rows_committed
+    reader = pd.read_csv(csv_file, dtype=SEED_DTYPES, chunksize=SEED_CHUNK_SIZE)
+    for chunk in reader:
+        if rows_to_skip:
+            skipped = min(rows_to_skip, len(chunk))
+            chunk = chunk.iloc[skipped:].copy()
+            rows_to_skip -= skipped
+            if chunk.empty:
+                continue
+        chunk['date'] = pd.to_datetime(chunk['date']).dt.date
+        with engine.begin() as conn:
+            chunk.to_sql(SaleDB.__tablename__, con=conn, if_exists='append', index=False, method='multi',
+                         chunksize=SEED_INSERT_ROWS)
+            rows_committed += len(chunk)
+            conn.execute(
+                update(SeedProgressDB).where(SeedProgressDB.source == csv_file).values(rows_committed=rows_committed)
+            )
+        print(f"Seeded {rows_committed} rows...")
+
+    with engine.begin() as conn:
+        conn.execute(update(SeedProgressDB).where(SeedProgressDB.source == csv_file).values(completed=True))
+
+
 def create_db_and_seed():
     Base.metadata.create_all(bind=engine)
+    # create_all only builds indexes together with new tables, so add any that older databases are missing.
+    for index in SaleDB.__table__.indexes:
+        index.create(bind=engine, checkfirst=True)
+    with engine.begin() as conn:
+        # Older databases still carry this prefix of ix_sales_category_date, which only costs writes.
+        conn.execute(text("DROP INDEX IF EXISTS ix_sales_category"))
 
     db = SessionLocal()
     try:
+        progress = db.get(SeedProgressDB, CSV_FILE)
         is_empty = db.query(SaleDB).first() is None
-        if is_empty and os.path.exists(CSV_FILE):
-            print(f"Database is empty. Seeding data from {CSV_FILE}...")
-            df = pd.read_csv(CSV_FILE)
-
-            df['date'] = pd.to_datetime(df['date']).dt.date
-
-            df.to_sql(SaleDB.__tablename__, con=engine, if_exists='append', index=False)
+        seed_pending = progress is not None and not progress.completed
+        if (is_empty or seed_pending) and os.path.exists(CSV_FILE):
+            print(f"Seeding data from {CSV_FILE}...")
+            seed_from_csv(CSV_FILE)
             print("Database seeding complete.")
+            with engine.begin() as conn:
+                rebuild_rollups(conn)
+                rebuild_sketches(conn)
+
+        rollups_missing = db.query(SalesTotalRollupDB).first() is None
+        if rollups_missing and db.query(SaleDB).first() is not None:
+            print("Building sales rollup tables...")
+            with engine.begin() as conn:
+                rebuild_rollups(conn)
+
+        sketches_missing = db.query(SalesSketchDB).first() is None
+        if sketches_missing and db.query(SaleDB).first() is not None:
+            print("Building sales distribution sketches...")
+            with engine.begin() as conn:
+                rebuild_sketches(conn)
     finally:
         db.close()
 
@@ -87,10 +692,27 @@ def create_db_and_seed():
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     print("Lifespan: Startup event triggered.")
-    create_db_and_seed()
+    if not SKIP_SEED:
+        create_db_and_seed()
+    if SHARED_CACHE_ENABLED:
+        # Results cached by an earlier run may predate offline changes to sales.db.
+        data_version.bump()
+    # Loaded before serving so that every later write patches an already-loaded series.
+    with SessionLocal() as db:
+        for key in aggregate_series:
+            aggregate_series[key].load(query_rollup_rows(db, key), data_version.current())
+    render_pool.start()
+    if GROUP_COMMIT_ENABLED:
+        group_committer.start()
+    if WARMUP_ENABLED:
+        threading.Thread(target=render_pool.warm_up, name="plot-warm-up", daemon=True).start()
     print("Lifespan: Database and seeding complete. Yielding control.")
     yield
     print("Lifespan: Shutdown event triggered.")
+    group_committer.stop()
+    render_pool.shutdown()
+    if DB_MODE == "async":
+        await async_engine.dispose()
 
 
 app = FastAPI(
@@ -99,6 +721,7 @@ app = FastAPI(
     version="1.0.0",
     lifespan=lifespan
 )
+app.add_middleware(MetricsMiddleware, registry=metrics)
 
 
 def get_db():
@@ -113,15 +736,356 @@ def get_db():
 def create_sale(sale: SaleCreate, db: Session = Depends(get_db)):
     db_sale = SaleDB(**sale.model_dump())
     db.add(db_sale)
+    added = apply_sale_to_rollups(db, sale.model_dump(), 1)
+    add_sales_to_sketches(db, [sale.model_dump()])
     db.commit()
     db.refresh(db_sale)
+    apply_series_changes(added, 1)
+    data_version.bump()
     return db_sale
 
 
-@app.get("/sales/", response_model=List[Sale], summary="List all sales")
-def read_sales(skip: int = 0, limit: int = 100, db: Session = Depends(get_db)):
-    sales = db.query(SaleDB).offset(skip).limit(limit).all()
-    return sales
+def commit_sales_batch(sales: List[dict]) -> tuple:
+    """Inserts one batch with a single multi-row INSERT and updates the rollups in the same transaction.
+
+    Returns the new ids in the order of sales and the rollup deltas for publish_sales_batch.
+    """
+    db = SessionLocal()
+    try:
+        sale_ids = db.scalars(insert(SaleDB).returning(SaleDB.id, sort_by_parameter_order=True), sales).all()
+        added = apply_sales_to_rollups(db, sales, 1)
+        add_sales_to_sketches(db, sales)
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+    return sale_ids, added
+
+
+def publish_sales_batch(sale_ids: List[int], sales: List[dict], added: dict):
+    """Brings the series and the data version up to date with a committed batch."""
+    apply_series_changes(added, 1)
+    data_version.bump()
+
+
+def insert_sales_batch(sales: List[dict]) -> List[int]:
+    sale_ids, added = commit_sales_batch(sales)
+    publish_sales_batch(sale_ids, sales, added)
+    return sale_ids
+
+
+def flush_sales_group(sales: List[dict]) -> List[int]:
+    """insert_sales_batch for the group committer, which must not retry a group once it has committed."""
+    sale_ids, added = commit_sales_batch(sales)
+    try:
+        publish_sales_batch(sale_ids, sales, added)
+    except Exception as e:
+        raise CommittedFlushError(sale_ids) from e
+    return sale_ids
+
+
+async def create_sale_grouped(sale: SaleCreate):
+    """POST /sales/ in group-commit mode: waits until the group holding this sale has committed."""
+    sale_values = sale.model_dump()
+    sale_id = await asyncio.wrap_future(group_committer.submit(sale_values))
+    return {**sale_values, "id": sale_id}
+
+
+async def iter_lines(request: Request):
+    """Yields the raw lines of the request body, without the line ending or a leading UTF-8 BOM."""
+    pending = b""
+    first = True
+    async for chunk in request.stream():
+        pending += chunk
+        *lines, pending = pending.split(b"\n")
+        for line in lines:
+            if first:
+                line = line.removeprefix(codecs.BOM_UTF8)
+                first = False
+            yield line.rstrip(b"\r")
+    if pending:
+        yield (pending.removeprefix(codecs.BOM_UTF8) if first else pending).rstrip(b"\r")
+
+
+async def iter_records(request: Request, source_format: str):
+    """Yields (line number, CSV header, raw line) triples from an NDJSON or CSV body as it streams in."""
+    header = None
+    line_number = 0
+    async for line in iter_lines(request):
+        line_number += 1
+        if not line.strip():
+            continue
+        if source_format == "ndjson":
+            yield line_number, None, line
+        elif header is None:
+            try:
+                header = next(csv.reader([line.decode("utf-8")]))
+            except UnicodeDecodeError:
+                raise HTTPException(status_code=400, detail=f"CSV header on line {line_number} is not valid UTF-8")
+        else:
+            yield line_number, header, line
+
+
+def parse_record(line: bytes, header: Optional[List[str]]) -> SaleCreate:
+    """Decodes and validates one bulk line; raises ValueError (UnicodeDecodeError included) for a bad one."""
+    text = line.decode("utf-8")
+    if header is None:
+        return SaleCreate.model_validate_json(text)
+    return SaleCreate.model_validate(dict(zip(header, next(csv.reader([text])))))
+
+
+@app.post("/sales/bulk", response_model=BulkIngestResult, summary="Bulk-insert sales from an NDJSON or CSV stream")
+async def create_sales_bulk(
+        request: Request,
+        source_format: Optional[Literal["ndjson", "csv"]] = Query(default=None, alias="format"),
+        batch_size: int = Query(default=BULK_BATCH_SIZE, ge=1, le=100_000)
+):
+    if source_format is None:
+        content_type = request.headers.get("content-type", "")
+        source_format = "csv" if "csv" in content_type else "ndjson"
+
+    inserted = 0
+    rejected = 0
+    batches = []
+    errors = []
+    pending = []
+
+    async def flush():
+        nonlocal inserted
+        try:
+            count = len(await run_in_threadpool(insert_sales_batch, pending))
+        except Exception as e:
+            raise HTTPException(
+                status_code=500,
+                detail=f"Error inserting batch {len(batches) + 1} after {inserted} committed rows: {e}"
+            )
+        inserted += count
+        batches.append({"batch": len(batches) + 1, "inserted": count})
+        pending.clear()
+
+    async for line_number, header, line in iter_records(request, source_format):
+        try:
+            sale = parse_record(line, header)
+        except ValueError as e:
+            rejected += 1
+            if len(errors) < BULK_MAX_REPORTED_ERRORS:
+                errors.append({"line": line_number, "error": str(e)})
+            continue
+
+        pending.append(sale.model_dump())
+        if len(pending) >= batch_size:
+            await flush()
+
+    if pending:
+        await flush()
+
+    return {"inserted": inserted, "rejected": rejected, "batches": batches, "errors": errors}
+
+
+def id_list_clause(sale_ids: List[int]):
+    """SaleDB.id IN the given ids, bound as one JSON parameter so lists of any length fit in one statement."""
+    values = func.json_each(json.dumps(sale_ids)).table_valued("value")
+    return SaleDB.id.in_(select(values.c.value))
+
+
+def selection_clause(selection: SaleSelection):
+    conditions = []
+    if selection.ids is not None:
+        conditions.append(id_list_clause(selection.ids))
+    if selection.category is not None:
+        conditions.append(SaleDB.category == selection.category)
+    if selection.start is not None:
+        conditions.append(SaleDB.date >= selection.start)
+    if selection.end is not None:
+        conditions.append(SaleDB.date <= selection.end)
+    if not conditions:
+        raise HTTPException(status_code=400, detail="Give at least one of ids, category, start or end.")
+    return and_(*conditions)
+
+
+SALE_FIELDS = ("product", "category", "quantity", "price", "date")
+SALE_COLUMNS = (SaleDB.id, *(getattr(SaleDB, field) for field in SALE_FIELDS))
+
+
+@app.patch("/sales/bulk", response_model=BulkMutationResult, summary="Update every sale matching ids or filters")
+def update_sales_bulk(request: BulkUpdateRequest, db: Session = Depends(get_db)):
+    changes = request.changes.model_dump(exclude_none=True)
+    if not changes:
+        raise HTTPException(status_code=400, detail="No changes given.")
+    where = selection_clause(request)
+
+    # The old values leave the rollups through one GROUP BY per rollup, then a single UPDATE ... RETURNING hands
+    # back the new values for the rollups and the sketches. All of it runs under the write lock.
+    begin_write(db)
+    old_cells = set(db.execute(select(SaleDB.date, SaleDB.category).where(where).distinct()).all())
+    removed = apply_matching_sales_to_rollups(db, where, -1)
+    rows = db.execute(
+        update(SaleDB).where(where).values(**changes).returning(*SALE_COLUMNS),
+        execution_options={"synchronize_session": False}
+    ).all()
+    sales = [dict(zip(SALE_FIELDS, row[1:])) for row in rows]
+    added = apply_sales_to_rollups(db, sales, 1)
+    rebuild_sketch_cells(db, old_cells | {(sale["date"], sale["category"]) for sale in sales})
+    db.commit()
+
+    if rows:
+        apply_series_changes(removed, -1)
+        apply_series_changes(added, 1)
+        data_version.bump()
+    return {"affected": len(rows)}
+
+
+@app.delete("/sales/bulk", response_model=BulkMutationResult, summary="Delete every sale matching ids or filters")
+def delete_sales_bulk(request: SaleSelection, db: Session = Depends(get_db)):
+    where = selection_clause(request)
+
+    rows = db.execute(
+        delete(SaleDB).where(where).returning(*SALE_COLUMNS),
+        execution_options={"synchronize_session": False}
+    ).all()
+    sales = [dict(zip(SALE_FIELDS, row[1:])) for row in rows]
+    removed = apply_sales_to_rollups(db, sales, -1)
+    rebuild_sketch_cells(db, {(sale["date"], sale["category"]) for sale in sales})
+    db.commit()
+
+    if rows:
+        apply_series_changes(removed, -1)
+        data_version.bump()
+    return {"affected": len(rows)}
+
+
+def encode_cursor(last_id: int) -> str:
+    return base64.urlsafe_b64encode(json.dumps({"id": last_id}).encode()).decode()
+
+
+def decode_cursor(cursor: str) -> int:
+    if cursor == "":
+        return 0
+    try:
+        return int(json.loads(base64.urlsafe_b64decode(cursor.encode()))["id"])
+    except (ValueError, KeyError, TypeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+@app.get("/sales/", response_model=Union[List[Sale], SalePage], summary="List all sales")
+def read_sales(skip: int = 0, limit: int = 100, cursor: Optional[str] = None, db: Session = Depends(get_db)):
+    """Pass cursor (empty for the first page, then next_cursor) for keyset pagination by id.
+
+    Without it the legacy skip/limit list is returned.
+    """
+    if cursor is None:
+        sales = db.query(SaleDB).offset(skip).limit(limit).all()
+        return sales
+
+    last_id = decode_cursor(cursor)
+    sales = db.query(SaleDB).filter(SaleDB.id > last_id).order_by(SaleDB.id).limit(limit).all()
+    next_cursor = encode_cursor(sales[-1].id) if limit > 0 and len(sales) == limit else None
+    return {"items": sales, "next_cursor": next_cursor}
+
+
+EXPORT_COLUMNS = ["id", "product", "category", "quantity", "price", "date"]
+EXPORT_MEDIA_TYPES = {
+    "csv": "text/csv",
+    "ndjson": "application/x-ndjson",
+    "parquet": "application/vnd.apache.parquet"
+}
+
+
+def iter_sale_chunks(chunk_size: int):
+    """Yields lists of row tuples from a server-side cursor, never holding more than one chunk in memory."""
+    columns = [getattr(SaleDB, name) for name in EXPORT_COLUMNS]
+    with engine.connect() as conn:
+        result = conn.execution_options(stream_results=True, yield_per=chunk_size).execute(
+            select(*columns).order_by(SaleDB.id)
+        )
+        for partition in result.partitions(chunk_size):
+            yield partition
+
+
+def export_csv(chunk_size: int):
+    buf = io.StringIO()
+    writer = csv.writer(buf)
+    writer.writerow(EXPORT_COLUMNS)
+    for rows in iter_sale_chunks(chunk_size):
+        writer.writerows(rows)
+        yield buf.getvalue()
+        buf.seek(0)
+        buf.truncate()
+    yield buf.getvalue()
+
+
+def export_ndjson(chunk_size: int):
+    for rows in iter_sale_chunks(chunk_size):
+        yield "".join(
+            json.dumps(dict(zip(EXPORT_COLUMNS, row)), default=str) + "\n" for row in rows
+        )
+
+
+class ChunkSink(io.RawIOBase):
+    """Write-only file object whose contents are drained after every Parquet row group."""
+
+    def __init__(self):
+        self._chunks = []
+        self._position = 0
+
+    def writable(self):
+        return True
+
+    def write(self, data):
+        self._chunks.append(bytes(data))
+        self._position += len(data)
+        return len(data)
+
+    def tell(self):
+        return self._position
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+def export_parquet(chunk_size: int, pa, pq):
+    schema = pa.schema([
+        ("id", pa.int64()),
+        ("product", pa.string()),
+        ("category", pa.string()),
+        ("quantity", pa.int64()),
+        ("price", pa.float64()),
+        ("date", pa.date32())
+    ])
+    sink = ChunkSink()
+    with pq.ParquetWriter(sink, schema) as writer:
+        for rows in iter_sale_chunks(chunk_size):
+            writer.write_table(pa.Table.from_pylist([dict(zip(EXPORT_COLUMNS, row)) for row in rows], schema=schema))
+            yield sink.drain()
+    yield sink.drain()
+
+
+@app.get("/sales/export", summary="Stream every sale as CSV, NDJSON or Parquet")
+def export_sales(
+        export_format: Literal["csv", "ndjson", "parquet"] = Query(default="csv", alias="format"),
+        chunk_size: int = Query(default=EXPORT_CHUNK_SIZE, ge=1, le=1_000_000)
+):
+    if export_format == "parquet":
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError:
+            raise HTTPException(status_code=501, detail="Parquet export requires the pyarrow package.")
+        body = export_parquet(chunk_size, pa, pq)
+    elif export_format == "ndjson":
+        body = export_ndjson(chunk_size)
+    else:
+        body = export_csv(chunk_size)
+
+    return StreamingResponse(
+        body,
+        media_type=EXPORT_MEDIA_TYPES[export_format],
+        headers={"Content-Disposition": f'attachment; filename="sales.{export_format}"'}
+    )
 
 
 @app.get("/sales/{sale_id}", response_model=Sale, summary="Get a specific sale")
@@ -134,45 +1098,167 @@ def read_sale(sale_id: int, db: Session = Depends(get_db)):
 
 @app.put("/sales/{sale_id}", response_model=Sale, summary="Update a sale")
 def update_sale(sale_id: int, sale: SaleCreate, db: Session = Depends(get_db)):
+    begin_write(db)
     db_sale = db.query(SaleDB).filter(SaleDB.id == sale_id).first()
     if db_sale is None:
         raise HTTPException(status_code=404, detail="Sale not found")
 
+    old_cell = (db_sale.date, db_sale.category)
+    removed = apply_sale_to_rollups(db, sale_values(db_sale), -1)
+    added = apply_sale_to_rollups(db, sale.model_dump(), 1)
     for key, value in sale.model_dump().items():
         setattr(db_sale, key, value)
 
+    db.flush()
+    rebuild_sketch_cells(db, {old_cell, (sale.date, sale.category)})
     db.commit()
+    apply_series_changes(removed, -1)
+    apply_series_changes(added, 1)
+    data_version.bump()
     db.refresh(db_sale)
     return db_sale
 
 
 @app.delete("/sales/{sale_id}", response_model=MessageResponse, summary="Delete a sale")
 def delete_sale(sale_id: int, db: Session = Depends(get_db)):
+    begin_write(db)
     db_sale = db.query(SaleDB).filter(SaleDB.id == sale_id).first()
     if db_sale is None:
         raise HTTPException(status_code=404, detail="Sale not found")
 
+    cell = (db_sale.date, db_sale.category)
+    removed = apply_sale_to_rollups(db, sale_values(db_sale), -1)
     db.delete(db_sale)
+    db.flush()
+    rebuild_sketch_cells(db, {cell})
     db.commit()
+    apply_series_changes(removed, -1)
+    data_version.bump()
     return {"detail": "Sale deleted successfully"}
 
 
-@app.get("/analytics/summary", response_model=AnalyticsSummary, summary="Get sales analytics summary")
-def get_analytics_summary(db: Session = Depends(get_db)):
-    try:
-        query = db.query(SaleDB).statement
-        df = pd.read_sql(query, con=db.bind)
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Error reading data for analytics: {e}")
+EMPTY_SUMMARY = {
+    "total_revenue": 0,
+    "total_items_sold": 0,
+    "average_order_value": 0,
+    "sales_by_category": {},
+    "revenue_by_category": {}
+}
+
+
+def compute_summary_sql(db: Session) -> dict:
+    """Aggregates the summary inside SQLite with a single GROUP BY category scan."""
+    rows = db.query(
+        SaleDB.category,
+        func.sum(SaleDB.quantity),
+        func.sum(SaleDB.quantity * SaleDB.price),
+        func.count(SaleDB.id)
+    ).group_by(SaleDB.category).all()
+
+    num_orders = sum(count for _, _, _, count in rows)
+    if num_orders == 0:
+        return dict(EMPTY_SUMMARY)
+
+    total_revenue = round(sum(revenue or 0 for _, _, revenue, _ in rows), 2)
+    total_items_sold = int(sum(quantity or 0 for _, quantity, _, _ in rows))
+    average_order_value = round(total_revenue / num_orders, 2)
+
+    # NULL categories count towards the totals but, like pandas' groupby, not towards the breakdowns.
+    sales_by_category = {category: int(quantity or 0) for category, quantity, _, _ in rows if category is not None}
+    revenue_by_category = {category: round(revenue or 0, 2) for category, _, revenue, _ in rows if category is not None}
+
+    return {
+        "total_revenue": total_revenue,
+        "total_items_sold": total_items_sold,
+        "average_order_value": average_order_value,
+        "sales_by_category": sales_by_category,
+        "revenue_by_category": revenue_by_category
+    }
+
+
+def query_daily_rollup(db: Session) -> list:
+    rows = db.query(
+        SalesDailyRollupDB.date,
+        SalesDailyRollupDB.revenue,
+        SalesDailyRollupDB.quantity,
+        SalesDailyRollupDB.orders
+    ).order_by(SalesDailyRollupDB.date).all()
+    return [tuple(row) for row in rows]
+
+
+def query_category_rollup(db: Session) -> list:
+    rows = db.query(
+        SalesCategoryRollupDB.category,
+        SalesCategoryRollupDB.revenue,
+        SalesCategoryRollupDB.quantity,
+        SalesCategoryRollupDB.orders
+    ).order_by(SalesCategoryRollupDB.category).all()
+    return [tuple(row) for row in rows]
+
+
+def query_total_rollup(db: Session) -> list:
+    rows = db.query(
+        SalesTotalRollupDB.scope,
+        SalesTotalRollupDB.revenue,
+        SalesTotalRollupDB.quantity,
+        SalesTotalRollupDB.orders
+    ).all()
+    return [tuple(row) for row in rows]
+
+
+def summary_from_rollup_rows(rows: list, total_rows: list) -> dict:
+    """Builds the summary from (category, revenue, quantity, orders) rows and the single totals row.
+
+    The totals include sales without a category; like pandas' groupby, the breakdowns do not.
+    """
+    if not total_rows or total_rows[0][3] == 0:
+        return dict(EMPTY_SUMMARY)
+
+    _, revenue, quantity, num_orders = total_rows[0]
+    total_revenue = round(revenue, 2)
+    total_items_sold = int(quantity)
+
+    return {
+        "total_revenue": total_revenue,
+        "total_items_sold": total_items_sold,
+        "average_order_value": round(total_revenue / num_orders, 2),
+        "sales_by_category": {category: int(quantity) for category, _, quantity, _ in rows},
+        "revenue_by_category": {category: round(revenue, 2) for category, revenue, _, _ in rows}
+    }
+
+
+def compute_summary_rollups(db: Session) -> dict:
+    """Builds the summary from the rollups, so its cost only depends on the number of categories."""
+    return summary_from_rollup_rows(query_category_rollup(db), query_total_rollup(db))
+
+
+def query_rollup_rows(db: Session, key: str) -> list:
+    if key == "date":
+        return query_daily_rollup(db)
+    return query_category_rollup(db) if key == "category" else query_total_rollup(db)
+
+
+def load_series(db: Session, key: str) -> list:
+    """Rows of the shared aggregate series for key ("date" or "category"), loading it on first use."""
+    series = aggregate_series[key]
+    if SHARED_CACHE_ENABLED:
+        version = data_version.current()
+        if series.version != version:
+            series.load(query_rollup_rows(db, key), version)
+    elif not series.loaded:
+        series.load(query_rollup_rows(db, key))
+    return series.rows()
+
+
+def compute_summary_pandas(db: Session) -> dict:
+    """Original in-memory implementation, kept as the reference for benchmarks."""
+    import pandas as pd
+
+    query = db.query(SaleDB).statement
+    df = pd.read_sql(query, con=db.bind)
 
     if df.empty:
-        return {
-            "total_revenue": 0,
-            "total_items_sold": 0,
-            "average_order_value": 0,
-            "sales_by_category": {},
-            "revenue_by_category": {}
-        }
+        return dict(EMPTY_SUMMARY)
 
     df['revenue'] = df['quantity'] * df['price']
 
@@ -194,6 +1280,169 @@ def get_analytics_summary(db: Session = Depends(get_db)):
     }
 
 
+def shared_result(name: str):
+    """Serves the decorated analytics handler through the shared result cache when SHARED_CACHE_ENABLED.
+
+    The key is name, the data version and the handler's arguments other than db, so a write in any worker
+    makes every older entry unreachable. Without the shared cache the handler is returned unchanged.
+    """
+    def decorate(handler):
+        if not SHARED_CACHE_ENABLED:
+            return handler
+        signature = inspect.signature(handler)
+
+        @functools.wraps(handler)
+        def wrapper(*args, **kwargs):
+            bound = signature.bind(*args, **kwargs)
+            bound.apply_defaults()
+            key = (name, data_version.current()) + tuple(
+                str(value) for argument, value in bound.arguments.items() if argument != "db"
+            )
+            cached = plot_cache.get(key)
+            if cached is not None:
+                return json.loads(cached[0])
+            result = handler(*args, **kwargs)
+            plot_cache.put(key, (json.dumps(jsonable_encoder(result)).encode(), None))
+            return result
+
+        return wrapper
+
+    return decorate
+
+
+@app.get("/analytics/summary", response_model=AnalyticsSummary, summary="Get sales analytics summary")
+@shared_result("summary")
+def get_analytics_summary(db: Session = Depends(get_db)):
+    try:
+        with metrics.stage("summary", "fetch"):
+            rows = load_series(db, "category")
+            total_rows = load_series(db, "scope")
+        with metrics.stage("summary", "aggregate"):
+            summary = summary_from_rollup_rows(rows, total_rows)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error reading data for analytics: {e}")
+
+    metrics.count_rows("summary", len(rows))
+    return summary
+
+
+def bucket_expression(bucket: str):
+    if bucket == "week":
+        # Monday of the sale's ISO week.
+        return func.date(SaleDB.date, "weekday 0", "-6 days")
+    if bucket == "month":
+        return func.strftime("%Y-%m-01", SaleDB.date)
+    return SaleDB.date
+
+
+@app.get("/analytics/timeseries", response_model=Timeseries, summary="Get bucketed sales metrics over a date range")
+@shared_result("timeseries")
+def get_analytics_timeseries(
+        start: Optional[datetime.date] = None,
+        end: Optional[datetime.date] = None,
+        bucket: Literal["day", "week", "month"] = "day",
+        category: Optional[str] = None,
+        db: Session = Depends(get_db)
+):
+    """Aggregates only the requested date range (inclusive), served by the covering date/category indexes."""
+    if start is not None and end is not None and start > end:
+        raise HTTPException(status_code=400, detail="start must not be after end")
+
+    bucket_key = bucket_expression(bucket).label("bucket")
+    query = db.query(
+        bucket_key,
+        func.sum(SaleDB.quantity * SaleDB.price),
+        func.sum(SaleDB.quantity),
+        func.count()
+    ).filter(SaleDB.date.isnot(None))
+    if start is not None:
+        query = query.filter(SaleDB.date >= start)
+    if end is not None:
+        query = query.filter(SaleDB.date <= end)
+    if category is not None:
+        query = query.filter(SaleDB.category == category)
+
+    try:
+        rows = query.group_by(bucket_key).order_by(bucket_key).all()
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error reading data for analytics: {e}")
+
+    points = [
+        {
+            "bucket": bucket_start,
+            "total_revenue": round(revenue or 0, 2),
+            "total_items_sold": int(quantity or 0),
+            "total_orders": orders,
+            "average_order_value": round((revenue or 0) / orders, 2) if orders else 0
+        }
+        for bucket_start, revenue, quantity, orders in rows
+    ]
+    return {"bucket": bucket, "start": start, "end": end, "category": category, "points": points}
+
+
+@app.get("/analytics/distribution", response_model=Distribution,
+         summary="Get approximate order value percentiles and distinct product counts")
+@shared_result("distribution")
+def get_analytics_distribution(
+        start: Optional[datetime.date] = None,
+        end: Optional[datetime.date] = None,
+        category: Optional[str] = None,
+        db: Session = Depends(get_db)
+):
+    """Merges the per-(day, category) sketches in range.
+
+    Percentiles are within ~1.5% rank error and distinct counts within ~1.6% relative error; see sales_sketches.
+    """
+    query = db.query(
+        SalesSketchDB.category,
+        SalesSketchDB.orders,
+        SalesSketchDB.order_values,
+        SalesSketchDB.products
+    )
+    if start is not None:
+        query = query.filter(SalesSketchDB.date >= start)
+    if end is not None:
+        query = query.filter(SalesSketchDB.date <= end)
+    if category is not None:
+        query = query.filter(SalesSketchDB.category == category)
+
+    try:
+        cells = query.all()
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error reading data for analytics: {e}")
+
+    orders = 0
+    order_values = KLLSketch()
+    products = HyperLogLog()
+    products_by_category = {}
+    for cell in cells:
+        orders += cell.orders
+        order_values.merge(KLLSketch.from_bytes(cell.order_values))
+        cell_products = HyperLogLog.from_bytes(cell.products)
+        products.merge(cell_products)
+        products_by_category.setdefault(cell.category, HyperLogLog()).merge(cell_products)
+
+    p50, p90, p95, p99 = [
+        round(value, 2) if value is not None else None
+        for value in order_values.quantiles([0.5, 0.9, 0.95, 0.99])
+    ]
+    return {
+        "orders": orders,
+        "median_order_value": p50,
+        "p90_order_value": p90,
+        "p95_order_value": p95,
+        "p99_order_value": p99,
+        "distinct_products": products.estimate() if cells else 0,
+        "distinct_products_by_category": {
+            name: sketch.estimate() for name, sketch in sorted(products_by_category.items())
+        }
+    }
+
+
+def load_plot_rows(db: Session, metric: str) -> list:
+    return load_series(db, "date" if metric in DAILY_METRICS else "category")
+
+
 @app.get("/analytics/plot", summary="Generate a plot for a specific sales metric")
 def get_analytics_plot(
         metric: Literal[
@@ -203,92 +1452,215 @@ def get_analytics_plot(
             "sales_by_category",
             "revenue_by_category"
         ],
+        plot_format: Literal["png", "svg", "json"] = Query(default="png", alias="format"),
+        max_points: int = Query(default=PLOT_MAX_POINTS, ge=3, le=100_000),
+        if_none_match: Optional[str] = Header(default=None),
         db: Session = Depends(get_db)
 ):
-    try:
-        query = db.query(SaleDB).statement
-        df = pd.read_sql(query, con=db.bind)
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Error reading data for analytics: {e}")
+    """Daily series longer than max_points are downsampled with LTTB first; format=json returns just that series."""
+    version = data_version.current()
+    cache_key = (metric, version, plot_format, max_points)
+    cached = plot_cache.get(cache_key)
+
+    if cached is None:
+        try:
+            with metrics.stage("plot", "fetch"):
+                rows = load_plot_rows(db, metric)
+        except Exception as e:
+            raise HTTPException(status_code=500, detail=f"Error reading data for analytics: {e}")
+
+        if not rows:
+            raise HTTPException(status_code=404, detail="No sales data found to plot.")
+
+        metrics.count_rows("plot", len(rows))
+        with metrics.stage("plot", "downsample"):
+            points = downsample_rows(metric, rows, max_points)
+
+        if plot_format == "json":
+            body = json.dumps({
+                "metric": metric,
+                "total_points": len(rows),
+                "points": [
+                    {"x": str(row[0]), "y": value} for row, value in zip(points, series_values(metric, points))
+                ]
+            }).encode()
+        else:
+            timings = {}
+            try:
+                body = render_pool.render(metric, points, timings, plot_format)
+            except RenderPoolSaturated as e:
+                raise HTTPException(status_code=503, detail=f"Plot renderer is busy, try again later: {e}",
+                                    headers={"Retry-After": "1"})
+            except RenderTimeout as e:
+                raise HTTPException(status_code=504, detail=str(e))
+            except RenderWorkerCrashed as e:
+                raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": "1"})
+            for stage_name, seconds in timings.items():
+                metrics.observe_stage("plot", stage_name, seconds)
+        cached = (body, f'"{hashlib.sha1(body).hexdigest()}"')
+        plot_cache.put(cache_key, cached)
+
+    body, etag = cached
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+    if if_none_match is not None and etag in [tag.strip() for tag in if_none_match.split(",")]:
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    metrics.count_bytes("plot", len(body))
+    return Response(content=body, media_type=PLOT_MEDIA_TYPES[plot_format], headers=headers)
+
+
+@app.get("/analytics/plot/cache", response_model=PlotCacheStats, summary="Get plot cache statistics")
+def get_plot_cache_stats():
+    return {**plot_cache.stats(), "data_version": data_version.current()}
+
+
+def plot_cache_metrics() -> list:
+    stats = plot_cache.stats()
+    return [
+        "# HELP sales_plot_cache_hits_total Plot requests served from the rendered-plot cache.",
+        "# TYPE sales_plot_cache_hits_total counter",
+        f"sales_plot_cache_hits_total {stats['hits']}",
+        "# HELP sales_plot_cache_misses_total Plot requests that had to render.",
+        "# TYPE sales_plot_cache_misses_total counter",
+        f"sales_plot_cache_misses_total {stats['misses']}",
+    ]
+
+
+metrics.collectors.append(plot_cache_metrics)
+
+
+def group_commit_metrics() -> list:
+    return [
+        "# HELP sales_group_commit_groups_total Transactions committed by the POST /sales/ group committer.",
+        "# TYPE sales_group_commit_groups_total counter",
+        f"sales_group_commit_groups_total {group_committer.groups}",
+        "# HELP sales_group_commit_rows_total Sales committed by the POST /sales/ group committer.",
+        "# TYPE sales_group_commit_rows_total counter",
+        f"sales_group_commit_rows_total {group_committer.items}",
+    ]
+
+
+if GROUP_COMMIT_ENABLED:
+    metrics.collectors.append(group_commit_metrics)
+
+
+@app.get("/metrics", include_in_schema=False)
+def get_metrics():
+    if not metrics.enabled:
+        raise HTTPException(status_code=404, detail="Metrics are disabled.")
+    return PlainTextResponse(metrics.render(), media_type="text/plain; version=0.0.4")
+
+
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
 
-    if df.empty:
-        raise HTTPException(status_code=404, detail="No sales data found to plot.")
 
-    df['date'] = pd.to_datetime(df['date'])
-    df['revenue'] = df['quantity'] * df['price']
-    df = df.sort_values('date')
+async def create_sale_async(sale: SaleCreate, db: "AsyncSession" = Depends(get_async_db)):
+    return await db.run_sync(lambda session: create_sale(sale, session))
 
-    fig, ax = plt.subplots(figsize=(10, 6))
 
-    if metric in ["total_revenue", "total_items_sold", "average_order_value"]:
-        daily_data = df.groupby('date').agg(
-            total_revenue=('revenue', 'sum'),
-            total_items_sold=('quantity', 'sum'),
-            total_orders=('id', 'count')
-        )
-        daily_data['average_order_value'] = (daily_data['total_revenue'] / daily_data['total_orders']).round(2).fillna(
-            0)
-        daily_data = daily_data.reset_index()
-
-        if metric == "total_revenue":
-            color = 'tab:blue'
-            ax.set_xlabel("Date")
-            ax.set_ylabel("Total Revenue (USD)", color=color)
-            ax.plot(daily_data['date'], daily_data['total_revenue'], marker='o', linestyle='-', color=color,
-                    label="Total Revenue")
-            ax.tick_params(axis='y', labelcolor=color)
-            plt.title("Total Revenue Over Time")
-
-        elif metric == "total_items_sold":
-            color = 'tab:green'
-            ax.set_xlabel("Date")
-            ax.set_ylabel("Items Sold", color=color)
-            ax.plot(daily_data['date'], daily_data['total_items_sold'], marker='s', linestyle='--', color=color,
-                    label="Total Items Sold")
-            ax.tick_params(axis='y', labelcolor=color)
-            plt.title("Total Items Sold Over Time")
-
-        elif metric == "average_order_value":
-            color = 'tab:red'
-            ax.set_xlabel("Date")
-            ax.set_ylabel("Average Order Value (USD)", color=color)
-            ax.plot(daily_data['date'], daily_data['average_order_value'], marker='x', linestyle=':', color=color,
-                    label="Average Order Value")
-            ax.tick_params(axis='y', labelcolor=color)
-            plt.title("Average Order Value Over Time")
-
-        ax.legend(loc='upper left')
-
-    elif metric in ["sales_by_category", "revenue_by_category"]:
-        if metric == "sales_by_category":
-            category_data = df.groupby('category')['quantity'].sum().astype(int)
-            title = "Total Items Sold by Category"
-            y_label = "Total Items Sold"
-            color = 'tab:cyan'
-        else:
-            category_data = df.groupby('category')['revenue'].sum().round(2)
-            title = "Total Revenue by Category"
-            y_label = "Total Revenue (USD)"
-            color = 'tab:purple'
+async def read_sales_async(skip: int = 0, limit: int = 100, cursor: Optional[str] = None,
+                           db: "AsyncSession" = Depends(get_async_db)):
+    return await db.run_sync(lambda session: read_sales(skip, limit, cursor, session))
+
+
+async def read_sale_async(sale_id: int, db: "AsyncSession" = Depends(get_async_db)):
+    return await db.run_sync(lambda session: read_sale(sale_id, session))
+
+
+async def update_sale_async(sale_id: int, sale: SaleCreate, db: "AsyncSession" = Depends(get_async_db)):
+    return await db.run_sync(lambda session: update_sale(sale_id, sale, session))
+
+
+async def delete_sale_async(sale_id: int, db: "AsyncSession" = Depends(get_async_db)):
+    return await db.run_sync(lambda session: delete_sale(sale_id, session))
+
+
+async def get_analytics_summary_async(db: "AsyncSession" = Depends(get_async_db)):
+    return await db.run_sync(get_analytics_summary)
+
+
+async def get_analytics_timeseries_async(
+        start: Optional[datetime.date] = None,
+        end: Optional[datetime.date] = None,
+        bucket: Literal["day", "week", "month"] = "day",
+        category: Optional[str] = None,
+        db: "AsyncSession" = Depends(get_async_db)
+):
+    return await db.run_sync(lambda session: get_analytics_timeseries(start, end, bucket, category, session))
+
+
+async def get_analytics_distribution_async(
+        start: Optional[datetime.date] = None,
+        end: Optional[datetime.date] = None,
+        category: Optional[str] = None,
+        db: "AsyncSession" = Depends(get_async_db)
+):
+    return await db.run_sync(lambda session: get_analytics_distribution(start, end, category, session))
+
+
+ASYNC_ENDPOINTS = {
+    create_sale: create_sale_async,
+    read_sales: read_sales_async,
+    read_sale: read_sale_async,
+    update_sale: update_sale_async,
+    delete_sale: delete_sale_async,
+    get_analytics_summary: get_analytics_summary_async,
+    get_analytics_timeseries: get_analytics_timeseries_async,
+    get_analytics_distribution: get_analytics_distribution_async,
+}
+
+
+def swap_endpoints(replacements: dict):
+    """Swaps route handlers in place according to replacements, keeping route order and metadata."""
+    for index, route in enumerate(app.router.routes):
+        if isinstance(route, APIRoute) and route.endpoint in replacements:
+            app.router.routes[index] = APIRoute(
+                route.path,
+                replacements[route.endpoint],
+                methods=route.methods,
+                response_model=route.response_model,
+                status_code=route.status_code,
+                summary=route.summary
+            )
+
+
+def install_async_endpoints():
+    """Swaps the sync handlers for their AsyncSession twins.
 
-        category_data.plot(kind='bar', ax=ax, color=color)
-        ax.set_xlabel("Category")
-        ax.set_ylabel(y_label)
-        plt.title(title)
-        plt.xticks(rotation=45, ha='right')
+    The async twins run the same handler body through AsyncSession.run_sync, which executes it on the
+    event-loop thread: only the SQLite calls are handed to aiosqlite, while the Python work around them
+    blocks every other request. That makes async mode slower than sync mode under load (see
+    benchmarks/load_test.py), so it stays opt-in, and the bulk PATCH/DELETE handlers, which recompute
+    rollups and sketches in Python, keep running in the threadpool.
+    """
+    swap_endpoints(ASYNC_ENDPOINTS)
 
-    fig.tight_layout()
 
-    buf = io.BytesIO()
-    plt.savefig(buf, format='png')
-    buf.seek(0)
-    plt.close(fig)
+if DB_MODE == "async":
+    install_async_endpoints()
 
-    return Response(content=buf.getvalue(), media_type="image/png")
+if GROUP_COMMIT_ENABLED:
+    swap_endpoints({create_sale: create_sale_grouped, create_sale_async: create_sale_grouped})
 
 
 if __name__ == "__main__":
-    print("Starting FastAPI server at http://127.0.0.1:8000")
-    print("Access API docs at http://127.0.0.1:8000/docs")
-    uvicorn.run(app, host="127.0.0.1", port=8000)
+    parser = argparse.ArgumentParser(description="Run the Sales Analytics API.")
+    parser.add_argument("--workers", type=int, default=WORKERS, help="uvicorn worker processes (SALES_WORKERS)")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    args = parser.parse_args()
+    use_as_worker_main()
+
+    print(f"Starting FastAPI server at http://{args.host}:{args.port} with {args.workers} worker(s)")
+    print(f"Access API docs at http://{args.host}:{args.port}/docs")
+    if args.workers > 1:
+        # Workers are fresh interpreters that import the module by name and read their settings from the
+        # environment; seeding happens once here rather than racing in every worker's lifespan.
+        os.environ["SALES_WORKERS"] = str(args.workers)
+        create_db_and_seed()
+        os.environ["SALES_SKIP_SEED"] = "1"
+        uvicorn.run("SalesAnalyticsAPI:app", host=args.host, port=args.port, workers=args.workers)
+    else:
+        uvicorn.run(app, host=args.host, port=args.port)
 
@@ -0,0 +1,205 @@
+"""In-process ASGI load driver for SalesAnalyticsAPI (httpx + anyio, no sockets or server processes).
+
+The app is seeded from a synthetic CSV, then each workload is driven at increasing concurrency for a fixed
+duration, reporting throughput and p50/p99 latency. Results can be written as JSON and compared against an
+earlier run; the exit status is 1 when any (workload, concurrency) pair regressed beyond --threshold.
+Run from the Classworks directory:
+    python benchmarks/asgi_load.py --rows 100000 --json before.json
+    python benchmarks/asgi_load.py --rows 100000 --json after.json --baseline before.json
+"""
+import argparse
+import datetime
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import tempfile
+import time
+
+import anyio
+import httpx
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+CLASSWORKS_DIR = os.path.abspath(os.path.join(BENCH_DIR, ".."))
+sys.path.insert(0, CLASSWORKS_DIR)
+sys.path.insert(0, BENCH_DIR)
+
+from generate_sales import write_csv
+
+NEW_SALE = {"product": "Pen", "category": "Stationery", "quantity": 1, "price": 1.25, "date": "2025-01-01"}
+
+
+def read_request(rng: random.Random, rows: int):
+    return "GET", f"/sales/{rng.randint(1, rows)}", None, None
+
+
+def summary_request(rng: random.Random, rows: int):
+    return "GET", "/analytics/summary", None, None
+
+
+def plot_request(rng: random.Random, rows: int):
+    metric = rng.choice(["total_revenue", "total_items_sold", "sales_by_category"])
+    return "GET", "/analytics/plot", {"metric": metric}, None
+
+
+def insert_request(rng: random.Random, rows: int):
+    return "POST", "/sales/", None, NEW_SALE
+
+
+def mixed_request(rng: random.Random, rows: int):
+    roll = rng.random()
+    if roll < 0.5:
+        return read_request(rng, rows)
+    if roll < 0.65:
+        return "GET", "/sales/", {"cursor": "", "limit": 100}, None
+    if roll < 0.85:
+        return summary_request(rng, rows)
+    if roll < 0.9:
+        return plot_request(rng, rows)
+    return "POST", "/sales/", None, NEW_SALE
+
+
+WORKLOADS = {
+    "read": read_request,
+    "summary": summary_request,
+    "plot": plot_request,
+    "insert": insert_request,
+    "mixed": mixed_request,
+}
+
+
+def percentile(sorted_values: list, fraction: float) -> float:
+    return sorted_values[min(len(sorted_values) - 1, int(len(sorted_values) * fraction))]
+
+
+async def drive(client: httpx.AsyncClient, workload: str, rows: int, concurrency: int, duration: float) -> dict:
+    next_request = WORKLOADS[workload]
+    latencies = []
+    errors = 0
+    deadline = time.monotonic() + duration
+
+    async def worker(seed_value: int):
+        nonlocal errors
+        rng = random.Random(seed_value)
+        while time.monotonic() < deadline:
+            method, path, params, body = next_request(rng, rows)
+            started = time.perf_counter()
+            response = await client.request(method, path, params=params, json=body)
+            latencies.append(time.perf_counter() - started)
+            if response.status_code >= 400:
+                errors += 1
+
+    started = time.monotonic()
+    async with anyio.create_task_group() as tg:
+        for i in range(concurrency):
+            tg.start_soon(worker, i)
+    elapsed = time.monotonic() - started
+
+    latencies.sort()
+    return {
+        "workload": workload,
+        "concurrency": concurrency,
+        "requests": len(latencies),
+        "errors": errors,
+        "rps": len(latencies) / elapsed,
+        "p50_ms": percentile(latencies, 0.5) * 1000,
+        "p99_ms": percentile(latencies, 0.99) * 1000,
+    }
+
+
+async def run(args) -> list:
+    import SalesAnalyticsAPI
+
+    app = SalesAnalyticsAPI.app
+    results = []
+    # ASGITransport does not send lifespan events, so seeding and the series load are run explicitly.
+    async with app.router.lifespan_context(app):
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=60) as client:
+            print(f"{'workload':<8} {'conc':>4} {'requests':>9} {'errors':>7} {'req/s':>9} {'p50 ms':>8} {'p99 ms':>8}")
+            for workload in args.workloads:
+                # An unrecorded pass starts the render workers and fills caches before anything is measured.
+                await drive(client, workload, args.rows, 1, args.warmup)
+                for concurrency in args.concurrency:
+                    result = await drive(client, workload, args.rows, concurrency, args.duration)
+                    print(f"{workload:<8} {concurrency:>4} {result['requests']:>9} {result['errors']:>7} "
+                          f"{result['rps']:>9.1f} {result['p50_ms']:>8.2f} {result['p99_ms']:>8.2f}")
+                    results.append(result)
+    return results
+
+
+def git_revision() -> str:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=CLASSWORKS_DIR, capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def compare(baseline_path: str, results: list, threshold: float) -> bool:
+    """Prints per-pair changes against a baseline run and returns True when anything regressed."""
+    with open(baseline_path) as f:
+        baseline = {(r["workload"], r["concurrency"]): r for r in json.load(f)["results"]}
+
+    regressed = False
+    print(f"\nCompared with {baseline_path} (threshold {threshold:.0%}):")
+    for result in results:
+        before = baseline.get((result["workload"], result["concurrency"]))
+        if before is None:
+            continue
+        rps_change = result["rps"] / before["rps"] - 1 if before["rps"] else 0.0
+        p99_change = result["p99_ms"] / before["p99_ms"] - 1 if before["p99_ms"] else 0.0
+        flag = rps_change < -threshold or p99_change > threshold
+        regressed = regressed or flag
+        print(f"  {result['workload']:<8} c={result['concurrency']:<4} req/s {rps_change:+7.1%}  "
+              f"p99 {p99_change:+7.1%}{'  REGRESSION' if flag else ''}")
+    return regressed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=10_000)
+    parser.add_argument("--workloads", nargs="+", choices=sorted(WORKLOADS), default=["read", "summary", "mixed"])
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 4, 16, 64])
+    parser.add_argument("--duration", type=float, default=5, help="seconds per (workload, concurrency) pair")
+    parser.add_argument("--warmup", type=float, default=1, help="unrecorded seconds per workload")
+    parser.add_argument("--json", help="write results to this file")
+    parser.add_argument("--baseline", help="JSON from an earlier run to compare against")
+    parser.add_argument("--threshold", type=float, default=0.10,
+                        help="relative req/s drop or p99 increase counted as a regression")
+    args = parser.parse_args()
+
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory() as workdir:
+        print(f"Generating {args.rows} rows...")
+        write_csv(os.path.join(workdir, "sales_data.csv"), args.rows)
+        # The app opens ./sales.db and ./sales_data.csv relative to the working directory.
+        os.chdir(workdir)
+        try:
+            results = anyio.run(run, args)
+        finally:
+            os.chdir(cwd)
+
+    report = {
+        "meta": {
+            "revision": git_revision(),
+            "timestamp": datetime.datetime.now(datetime.timezone.utc).isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "db_mode": os.environ.get("SALES_DB_MODE", "sync"),
+            "rows": args.rows,
+            "duration": args.duration,
+        },
+        "results": results,
+    }
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(report, f, indent=2)
+            f.write("\n")
+    if args.baseline and compare(args.baseline, results, args.threshold):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
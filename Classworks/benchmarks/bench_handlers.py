@@ -0,0 +1,109 @@
+"""pytest-benchmark micro-benchmarks for the summary, plot and CRUD handlers of SalesAnalyticsAPI.
+
+Every request goes through the full ASGI stack in-process against a database seeded from a synthetic CSV of
+BENCH_ROWS rows (default 10,000). Run from the Classworks directory and keep the JSON to compare commits:
+    BENCH_ROWS=100000 python -m pytest benchmarks/bench_handlers.py --benchmark-json=handlers.json
+    python -m pytest benchmarks/bench_handlers.py --benchmark-compare=handlers.json --benchmark-compare-fail=median:10%
+"""
+import os
+import sys
+import tempfile
+
+import pytest
+
+pytest.importorskip("pytest_benchmark")
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(BENCH_DIR, ".."))
+sys.path.insert(0, BENCH_DIR)
+
+from generate_sales import write_csv
+
+BENCH_ROWS = int(os.environ.get("BENCH_ROWS", "10000"))
+SALE = {"product": "Pen", "category": "Stationery", "quantity": 3, "price": 1.25, "date": "2024-06-01"}
+
+
+@pytest.fixture(scope="module")
+def api():
+    from fastapi.testclient import TestClient
+
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory() as workdir:
+        write_csv(os.path.join(workdir, "sales_data.csv"), BENCH_ROWS)
+        # The app opens ./sales.db and ./sales_data.csv relative to the working directory.
+        os.chdir(workdir)
+        try:
+            import SalesAnalyticsAPI
+            with TestClient(SalesAnalyticsAPI.app) as client:
+                yield SalesAnalyticsAPI, client
+        finally:
+            os.chdir(cwd)
+
+
+def new_sale(client) -> int:
+    response = client.post("/sales/", json=SALE)
+    assert response.status_code == 201
+    return response.json()["id"]
+
+
+def test_summary(benchmark, api):
+    _, client = api
+    response = benchmark(client.get, "/analytics/summary")
+    assert response.status_code == 200
+
+
+@pytest.mark.parametrize("metric", ["total_revenue", "revenue_by_category"])
+@pytest.mark.parametrize("plot_format", ["png", "svg", "json"])
+def test_plot_render(benchmark, api, metric, plot_format):
+    module, client = api
+
+    def setup():
+        # Bumping the data version before each round forces a cache miss and a fresh render.
+        module.data_version.bump()
+        return ("/analytics/plot",), {"params": {"metric": metric, "format": plot_format}}
+
+    response = benchmark.pedantic(client.get, setup=setup, rounds=10, warmup_rounds=1)
+    assert response.status_code == 200
+
+
+def test_plot_cached(benchmark, api):
+    _, client = api
+    client.get("/analytics/plot", params={"metric": "total_revenue"})
+    response = benchmark(client.get, "/analytics/plot", params={"metric": "total_revenue"})
+    assert response.status_code == 200
+
+
+def test_create_sale(benchmark, api):
+    _, client = api
+    response = benchmark(client.post, "/sales/", json=SALE)
+    assert response.status_code == 201
+
+
+def test_read_sale(benchmark, api):
+    _, client = api
+    sale_id = new_sale(client)
+    response = benchmark(client.get, f"/sales/{sale_id}")
+    assert response.status_code == 200
+
+
+def test_update_sale(benchmark, api):
+    _, client = api
+    sale_id = new_sale(client)
+    response = benchmark(client.put, f"/sales/{sale_id}", json=dict(SALE, quantity=4))
+    assert response.status_code == 200
+
+
+def test_delete_sale(benchmark, api):
+    _, client = api
+
+    def setup():
+        return (f"/sales/{new_sale(client)}",), {}
+
+    response = benchmark.pedantic(client.delete, setup=setup, rounds=50)
+    assert response.status_code == 200
+
+
+def test_list_sales_page(benchmark, api):
+    _, client = api
+    response = benchmark(client.get, "/sales/", params={"cursor": "", "limit": 100})
+    assert response.status_code == 200
@@ -0,0 +1,74 @@
+"""Measures the cold import cost of SalesAnalyticsAPI with `python -X importtime`.
+
+By default the working tree is measured; pass --rev to also measure the Classworks directory at an older git
+revision (exported with git archive) for a before/after comparison:
+    python benchmarks/bench_import.py --rev HEAD~1
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import tarfile
+import tempfile
+
+CLASSWORKS_DIR = os.path.abspath(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+MODULE = "SalesAnalyticsAPI"
+WATCHED = ["pandas", "matplotlib", "numpy", "fastapi", "sqlalchemy"]
+
+
+def import_profile(directory: str) -> dict:
+    """Returns {module: cumulative microseconds} for one fresh interpreter importing MODULE."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {MODULE}"],
+        cwd=directory, capture_output=True, text=True, check=True
+    )
+    profile = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        name = name.strip()
+        profile.setdefault(name, int(cumulative))
+    return profile
+
+
+def measure(directory: str, runs: int) -> dict:
+    profiles = [import_profile(directory) for _ in range(runs)]
+    summary = {"total_ms": statistics.median(profile[MODULE] for profile in profiles) / 1000}
+    for name in WATCHED:
+        times = [profile.get(name) for profile in profiles]
+        summary[name] = None if None in times else statistics.median(times) / 1000
+    return summary
+
+
+def export_revision(rev: str, target: str) -> str:
+    archive = os.path.join(target, "classworks.tar")
+    subprocess.run(["git", "archive", "--format=tar", "-o", archive, f"{rev}:Classworks"],
+                   cwd=os.path.dirname(CLASSWORKS_DIR), check=True)
+    with tarfile.open(archive) as tar:
+        tar.extractall(target)
+    return target
+
+
+def report(label: str, summary: dict):
+    print(f"{label}: {summary['total_ms']:.0f} ms to import {MODULE}")
+    for name in WATCHED:
+        value = summary[name]
+        print(f"  {name:<12} {'not imported' if value is None else f'{value:.0f} ms'}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--rev", help="git revision to compare against")
+    args = parser.parse_args()
+
+    if args.rev:
+        with tempfile.TemporaryDirectory() as tmp:
+            report(args.rev, measure(export_revision(args.rev, tmp), args.runs))
+    report("working tree", measure(CLASSWORKS_DIR, args.runs))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+"""Checks the sketch-backed /analytics/distribution figures against exact values.
+
+Seeds a synthetic table, builds the (day, category) sketches and prints the merged percentiles
+(as rank error) and distinct product counts (as relative error) next to exact answers from the raw rows.
+Run from the Classworks directory:
+    python benchmarks/bench_sketches.py --rows 500000
+
+The fixed-seed accuracy checks live in tests/test_sales_sketches.py.
+"""
+import argparse
+import bisect
+import os
+import sys
+import tempfile
+import time
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from SalesAnalyticsAPI import Base, SaleDB, rebuild_sketches, get_analytics_distribution
+from bench_summary import seed
+
+QUANTILES = {"median_order_value": 0.5, "p90_order_value": 0.9, "p95_order_value": 0.95, "p99_order_value": 0.99}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=200_000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_engine(f"sqlite:///{os.path.join(tmp, 'bench.db')}")
+        Base.metadata.create_all(bind=engine)
+        print(f"Seeding {args.rows} rows...")
+        seed(engine, args.rows)
+
+        started = time.perf_counter()
+        with engine.begin() as conn:
+            rebuild_sketches(conn)
+        print(f"rebuild: {time.perf_counter() - started:.2f} s")
+
+        db = sessionmaker(bind=engine)()
+        try:
+            started = time.perf_counter()
+            result = get_analytics_distribution(None, None, None, db)
+            print(f"query:   {(time.perf_counter() - started) * 1000:.1f} ms")
+
+            rows = db.query(SaleDB.quantity, SaleDB.price, SaleDB.product, SaleDB.category).all()
+        finally:
+            db.close()
+            engine.dispose()
+
+    values = sorted(quantity * price for quantity, price, _, _ in rows)
+    print(f"{'metric':<20} {'estimate':>10} {'exact':>10} {'rank error':>11}")
+    for name, fraction in QUANTILES.items():
+        estimate = result[name]
+        exact = values[min(len(values) - 1, int(fraction * len(values)))]
+        rank_error = bisect.bisect_right(values, estimate) / len(values) - fraction
+        print(f"{name:<20} {estimate:>10.2f} {exact:>10.2f} {rank_error:>+11.4f}")
+
+    exact_by_category = {}
+    for _, _, product, category in rows:
+        exact_by_category.setdefault(category, set()).add(product)
+    exact_total = len({product for _, _, product, _ in rows})
+    print(f"{'distinct products':<20} {result['distinct_products']:>10} {exact_total:>10}")
+    for category, products in sorted(exact_by_category.items()):
+        print(f"  {category:<18} {result['distinct_products_by_category'][category]:>10} {len(products):>10}")
+
+
+if __name__ == "__main__":
+    main()
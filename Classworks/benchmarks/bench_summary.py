@@ -0,0 +1,86 @@
+"""Compares the rollup and SQL-side summaries against the original pandas implementation.
+
+Run from the Classworks directory:
+    python benchmarks/bench_summary.py --rows 1000000
+"""
+import argparse
+import datetime
+import os
+import random
+import sys
+import tempfile
+import time
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from SalesAnalyticsAPI import (Base, SaleDB, rebuild_rollups, compute_summary_rollups, compute_summary_sql,
+                               compute_summary_pandas)
+from generate_sales import CATALOG
+
+def seed(engine, rows: int, batch_size: int = 50_000):
+    rng = random.Random(42)
+    start = datetime.date(2020, 1, 1)
+    with engine.begin() as conn:
+        for offset in range(0, rows, batch_size):
+            batch = []
+            for _ in range(min(batch_size, rows - offset)):
+                product, category, price = rng.choice(CATALOG)
+                batch.append({
+                    "product": product,
+                    "category": category,
+                    "quantity": rng.randint(1, 10),
+                    "price": price,
+                    "date": start + datetime.timedelta(days=rng.randrange(2000)),
+                })
+            conn.execute(SaleDB.__table__.insert(), batch)
+        rebuild_rollups(conn)
+
+
+def timed(fn, db, repeat: int):
+    best = float("inf")
+    result = None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = fn(db)
+        best = min(best, time.perf_counter() - started)
+    return best, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=200_000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_engine(f"sqlite:///{os.path.join(tmp, 'bench.db')}")
+        Base.metadata.create_all(bind=engine)
+        print(f"Seeding {args.rows} rows...")
+        seed(engine, args.rows)
+
+        db = sessionmaker(bind=engine)()
+        try:
+            rollup_time, rollup_result = timed(compute_summary_rollups, db, args.repeat)
+            sql_time, sql_result = timed(compute_summary_sql, db, args.repeat)
+            pandas_time, pandas_result = timed(compute_summary_pandas, db, args.repeat)
+        finally:
+            db.close()
+            engine.dispose()
+
+    print(f"rollup: {rollup_time * 1000:10.1f} ms")
+    print(f"sql:    {sql_time * 1000:10.1f} ms")
+    print(f"pandas: {pandas_time * 1000:10.1f} ms")
+    print(f"speedup (sql):    {pandas_time / sql_time:.1f}x")
+    print(f"speedup (rollup): {pandas_time / rollup_time:.1f}x")
+    for name, result in (("sql", sql_result), ("rollup", rollup_result)):
+        if result != pandas_result:
+            print(f"WARNING: {name} result differs from pandas")
+            print(f"  {name}: {result}")
+            print(f"  pandas: {pandas_result}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+"""Writes a synthetic sales CSV in the sales_data.csv schema (product,category,quantity,price,date).
+
+Rows are generated with NumPy in fixed-size chunks and streamed to disk, so 10^8 rows need no more memory than
+10^4. The same --seed always produces the same file. Run from the Classworks directory:
+    python benchmarks/generate_sales.py --rows 1000000 --out /tmp/sales_1m.csv
+"""
+import argparse
+import datetime
+import time
+
+import numpy as np
+
+CATALOG = [
+    ("Laptop", "Electronics", 999.99),
+    ("Mouse", "Electronics", 24.99),
+    ("Keyboard", "Electronics", 49.99),
+    ("Monitor", "Electronics", 189.00),
+    ("Desk", "Furniture", 249.50),
+    ("Chair", "Furniture", 129.00),
+    ("Lamp", "Furniture", 34.75),
+    ("Notebook", "Stationery", 3.49),
+    ("Pen", "Stationery", 1.25),
+    ("Book", "Fiction", 15.99),
+    ("Novel", "Fiction", 12.49),
+    ("Puzzle", "Toys", 19.99),
+]
+START_DATE = datetime.date(2020, 1, 1)
+DAYS = 2000
+MAX_QUANTITY = 10
+CHUNK_ROWS = 500_000
+
+
+def iter_chunks(rows: int, seed: int = 42, chunk_rows: int = CHUNK_ROWS):
+    """Yields (product_index, quantity, day_offset) NumPy arrays covering rows rows in total."""
+    rng = np.random.default_rng(seed)
+    for offset in range(0, rows, chunk_rows):
+        size = min(chunk_rows, rows - offset)
+        yield (rng.integers(0, len(CATALOG), size), rng.integers(1, MAX_QUANTITY + 1, size),
+               rng.integers(0, DAYS, size))
+
+
+def write_csv(path: str, rows: int, seed: int = 42):
+    prefixes = [f"{product},{category}," for product, category, _ in CATALOG]
+    prices = [f",{price}," for _, _, price in CATALOG]
+    dates = [(START_DATE + datetime.timedelta(days=day)).isoformat() for day in range(DAYS)]
+    with open(path, "w", newline="") as out:
+        out.write("product,category,quantity,price,date\n")
+        for products, quantities, days in iter_chunks(rows, seed):
+            out.write("".join(
+                f"{prefixes[product]}{quantity}{prices[product]}{dates[day]}\n"
+                for product, quantity, day in zip(products.tolist(), quantities.tolist(), days.tolist())
+            ))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=10_000)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--out", required=True, help="CSV path to write (not the checked-in sales_data.csv)")
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    write_csv(args.out, args.rows, args.seed)
+    print(f"Wrote {args.rows} rows to {args.out} in {time.perf_counter() - started:.1f} s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+"""HTTP load test comparing the sync and async database modes of SalesAnalyticsAPI.
+
+Each mode gets its own uvicorn server, which seeds a fresh database from a generate_sales CSV. The requests are
+asgi_load's mixed workload, driven over real sockets. Run from the Classworks directory:
+    python benchmarks/load_test.py --rows 100000 --concurrency 64 --duration 10
+"""
+import argparse
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+
+import anyio
+import httpx
+
+CLASSWORKS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+
+from asgi_load import drive
+from generate_sales import write_csv
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def start_server(mode: str, workdir: str, port: int) -> subprocess.Popen:
+    env = dict(os.environ, SALES_DB_MODE=mode, PYTHONPATH=CLASSWORKS_DIR)
+    return subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "SalesAnalyticsAPI:app", "--port", str(port), "--log-level", "warning"],
+        cwd=workdir, env=env, stdout=subprocess.DEVNULL
+    )
+
+
+def wait_until_ready(base_url: str, timeout: float = 300):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            if httpx.get(f"{base_url}/analytics/summary").status_code == 200:
+                return
+        except httpx.TransportError:
+            pass
+        time.sleep(0.2)
+    raise RuntimeError(f"Server at {base_url} did not become ready")
+
+
+async def drive_server(base_url: str, rows: int, concurrency: int, duration: float) -> dict:
+    async with httpx.AsyncClient(base_url=base_url, timeout=30) as client:
+        return await drive(client, "mixed", rows, concurrency, duration)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--duration", type=float, default=10)
+    parser.add_argument("--modes", nargs="+", default=["sync", "async"])
+    args = parser.parse_args()
+
+    results = {}
+    for mode in args.modes:
+        with tempfile.TemporaryDirectory() as workdir:
+            write_csv(os.path.join(workdir, "sales_data.csv"), args.rows)
+
+            port = free_port()
+            base_url = f"http://127.0.0.1:{port}"
+            server = start_server(mode, workdir, port)
+            try:
+                wait_until_ready(base_url)
+                results[mode] = anyio.run(drive_server, base_url, args.rows, args.concurrency, args.duration)
+            finally:
+                server.terminate()
+                server.wait()
+
+    print(f"{'mode':<6} {'requests':>9} {'errors':>7} {'req/s':>9} {'p50 ms':>8} {'p99 ms':>8}")
+    for mode, result in results.items():
+        print(f"{mode:<6} {result['requests']:>9} {result['errors']:>7} {result['rps']:>9.1f} "
+              f"{result['p50_ms']:>8.1f} {result['p99_ms']:>8.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,259 @@
+"""Plot rendering for SalesAnalyticsAPI.
+
+matplotlib is imported inside render_plot rather than at module level, so importing this module (and the API)
+stays cheap for workers that never draw a plot. Long daily series are thinned with LTTB before they are drawn.
+"""
+import datetime
+import importlib.util
+import io
+import multiprocessing
+import sys
+import threading
+import time
+from concurrent.futures import CancelledError, ProcessPoolExecutor, TimeoutError
+from concurrent.futures.process import BrokenProcessPool
+
+import numpy as np
+
+DAILY_METRICS = ["total_revenue", "total_items_sold", "average_order_value"]
+# Line plots only draw a marker per point up to this many points; beyond it markers just smear into the line.
+MARKER_LIMIT = 100
+
+DAILY_STYLES = {
+    "total_revenue": ("tab:blue", "Total Revenue (USD)", "o", "-", "Total Revenue", "Total Revenue Over Time"),
+    "total_items_sold": ("tab:green", "Items Sold", "s", "--", "Total Items Sold", "Total Items Sold Over Time"),
+    "average_order_value": ("tab:red", "Average Order Value (USD)", "x", ":", "Average Order Value",
+                            "Average Order Value Over Time"),
+}
+
+CATEGORY_STYLES = {
+    "sales_by_category": ("tab:cyan", "Total Items Sold", "Total Items Sold by Category"),
+    "revenue_by_category": ("tab:purple", "Total Revenue (USD)", "Total Revenue by Category"),
+}
+
+
+class RenderPoolSaturated(Exception):
+    pass
+
+
+class RenderTimeout(Exception):
+    pass
+
+
+class RenderWorkerCrashed(Exception):
+    pass
+
+
+def daily_values(metric: str, rows: list) -> list:
+    if metric == "total_revenue":
+        return [round(revenue, 2) for _, revenue, _, _ in rows]
+    if metric == "total_items_sold":
+        return [quantity for _, _, quantity, _ in rows]
+    return [round(revenue / orders, 2) if orders else 0 for _, revenue, _, orders in rows]
+
+
+def category_values(metric: str, rows: list) -> list:
+    if metric == "sales_by_category":
+        return [int(quantity) for _, _, quantity, _ in rows]
+    return [round(revenue, 2) for _, revenue, _, _ in rows]
+
+
+def series_values(metric: str, rows: list) -> list:
+    return daily_values(metric, rows) if metric in DAILY_METRICS else category_values(metric, rows)
+
+
+def lttb_indices(xs: list, ys: list, threshold: int) -> list:
+    """Largest-Triangle-Three-Buckets: indices of threshold points that keep the visual shape of the series.
+
+    The first and last points are always kept. Each bucket in between keeps the point forming the largest
+    triangle with the previously kept point and the average of the next bucket.
+    """
+    n = len(xs)
+    if threshold >= n or threshold < 3:
+        return list(range(n))
+
+    x = np.asarray(xs, dtype=np.float64)
+    y = np.asarray(ys, dtype=np.float64)
+    every = (n - 2) / (threshold - 2)
+    selected = [0]
+    anchor = 0
+    for bucket in range(threshold - 2):
+        start = int(bucket * every) + 1
+        end = int((bucket + 1) * every) + 1
+        next_end = min(int((bucket + 2) * every) + 1, n)
+        avg_x = x[end:next_end].mean()
+        avg_y = y[end:next_end].mean()
+        areas = np.abs((x[anchor] - avg_x) * (y[start:end] - y[anchor])
+                       - (x[anchor] - x[start:end]) * (avg_y - y[anchor]))
+        anchor = start + int(areas.argmax())
+        selected.append(anchor)
+    selected.append(n - 1)
+    return selected
+
+
+def downsample_rows(metric: str, rows: list, max_points: int) -> list:
+    """Daily rows reduced to at most max_points with LTTB on the metric's values; category rows pass through."""
+    if metric not in DAILY_METRICS or len(rows) <= max_points:
+        return rows
+    xs = [row[0].toordinal() for row in rows]
+    return [rows[index] for index in lttb_indices(xs, daily_values(metric, rows), max_points)]
+
+
+def render_plot(metric: str, rows: list, timings: dict = None, image_format: str = "png") -> bytes:
+    """Renders a metric to PNG or SVG with the object-oriented Figure API, so it never touches pyplot's state.
+
+    Daily metrics take (date, revenue, quantity, orders) rows and category metrics take
+    (category, revenue, quantity, orders) rows, both already aggregated. When timings is given, the seconds
+    spent drawing and encoding are stored under "render" and "encode".
+    """
+    started = time.perf_counter()
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    from matplotlib.figure import Figure
+
+    fig = Figure(figsize=(10, 6))
+    FigureCanvasAgg(fig)
+    ax = fig.add_subplot()
+
+    if metric in DAILY_METRICS:
+        color, y_label, marker, linestyle, label, title = DAILY_STYLES[metric]
+        ax.set_xlabel("Date")
+        ax.set_ylabel(y_label, color=color)
+        ax.plot([row[0] for row in rows], daily_values(metric, rows),
+                marker=marker if len(rows) <= MARKER_LIMIT else None, linestyle=linestyle, color=color, label=label)
+        ax.tick_params(axis='y', labelcolor=color)
+        ax.set_title(title)
+        ax.legend(loc='upper left')
+        fig.autofmt_xdate()
+
+    elif metric in CATEGORY_STYLES:
+        color, y_label, title = CATEGORY_STYLES[metric]
+        ax.bar([str(row[0]) for row in rows], category_values(metric, rows), color=color, width=0.5)
+        ax.set_xlabel("Category")
+        ax.set_ylabel(y_label)
+        ax.set_title(title)
+        ax.tick_params(axis='x', labelrotation=45)
+        for tick in ax.get_xticklabels():
+            tick.set_horizontalalignment('right')
+
+    else:
+        raise ValueError(f"Unknown metric: {metric}")
+
+    fig.tight_layout()
+    drawn = time.perf_counter()
+
+    buf = io.BytesIO()
+    fig.savefig(buf, format=image_format)
+    if timings is not None:
+        timings["render"] = drawn - started
+        timings["encode"] = time.perf_counter() - drawn
+    return buf.getvalue()
+
+
+def render_plot_timed(metric: str, rows: list, image_format: str) -> tuple:
+    """Worker entry point: the image plus its stage timings, since a dict argument cannot be filled across processes."""
+    timings = {}
+    return render_plot(metric, rows, timings, image_format), timings
+
+
+def use_as_worker_main():
+    """Has spawned worker processes run this module as their __main__ instead of the launching script.
+
+    spawn children re-import the parent's __main__ (as __mp_main__) before taking any work. When that is
+    SalesAnalyticsAPI.py run directly, every render worker would re-execute the whole API module, with its FastAPI
+    and SQLAlchemy imports, engine and cache setup, just to call render_plot_timed. Call it from the launcher.
+    """
+    sys.modules["__main__"].__spec__ = importlib.util.find_spec(__name__)
+
+
+class PlotRenderPool:
+    """Renders plots in worker processes with a bounded number of in-flight jobs.
+
+    render() raises RenderPoolSaturated immediately when max_pending renders are already queued or
+    running, and RenderTimeout when a single render takes longer than timeout seconds. A render that timed out
+    keeps its slot until its worker actually finishes, since a running job cannot be cancelled. If a worker
+    dies the executor is replaced and the render raises RenderWorkerCrashed.
+    """
+
+    def __init__(self, workers: int, max_pending: int, timeout: float):
+        self.workers = workers
+        self.max_pending = max_pending
+        self.timeout = timeout
+        self._slots = threading.BoundedSemaphore(max_pending)
+        self._executor = None
+        self._lock = threading.Lock()
+
+    def _new_executor(self) -> ProcessPoolExecutor:
+        # spawn keeps forked children from inheriting the server's threads and open SQLite handles.
+        return ProcessPoolExecutor(max_workers=self.workers, mp_context=multiprocessing.get_context("spawn"))
+
+    def start(self):
+        with self._lock:
+            if self._executor is None:
+                self._executor = self._new_executor()
+
+    def shutdown(self):
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=False, cancel_futures=True)
+                self._executor = None
+
+    def _replace_locked(self, broken: ProcessPoolExecutor):
+        if self._executor is broken:
+            broken.shutdown(wait=False, cancel_futures=True)
+            self._executor = self._new_executor()
+
+    def _restart(self, broken: ProcessPoolExecutor):
+        """Replaces broken with a fresh executor, unless another thread already did."""
+        with self._lock:
+            self._replace_locked(broken)
+
+    def _submit(self, *args) -> tuple:
+        """(executor, future) for the job, or (None, None) when the pool is not running."""
+        with self._lock:
+            executor = self._executor
+            if executor is None:
+                return None, None
+            try:
+                return executor, executor.submit(*args)
+            except BrokenProcessPool:
+                # The pool broke during an earlier render, which already reported it; retry once on a fresh one.
+                self._replace_locked(executor)
+                return self._executor, self._executor.submit(*args)
+
+    def warm_up(self):
+        """Starts every worker and has it import matplotlib by drawing a throwaway plot."""
+        sample = [(datetime.date(2025, 1, 1), 1.0, 1, 1)]
+        futures = [self._submit(render_plot, "total_revenue", sample)[1] for _ in range(self.workers)]
+        if None in futures:
+            render_plot("total_revenue", sample)
+            return
+        for future in futures:
+            future.result()
+
+    def render(self, metric: str, rows: list, timings: dict = None, image_format: str = "png") -> bytes:
+        if not self._slots.acquire(blocking=False):
+            raise RenderPoolSaturated(f"{self.max_pending} plot renders already in progress")
+        try:
+            executor, future = self._submit(render_plot_timed, metric, rows, image_format)
+        except BaseException:
+            self._slots.release()
+            raise
+        if future is None:
+            self._slots.release()
+            return render_plot(metric, rows, timings, image_format)
+        future.add_done_callback(lambda _: self._slots.release())
+
+        try:
+            image, worker_timings = future.result(timeout=self.timeout)
+        except TimeoutError:
+            future.cancel()
+            raise RenderTimeout(f"Plot render exceeded {self.timeout} seconds")
+        except BrokenProcessPool:
+            self._restart(executor)
+            raise RenderWorkerCrashed("A plot worker exited unexpectedly; the renderer has been restarted")
+        except CancelledError:
+            raise RenderPoolSaturated("Plot renderer is shutting down")
+
+        if timings is not None:
+            timings.update(worker_timings)
+        return image
@@ -0,0 +1,103 @@
+"""Group commit: coalesces concurrent single-row writes into one transaction.
+
+Callers submit an item and get a concurrent.futures.Future. A background thread takes the first waiting item,
+keeps collecting until max_items are queued or max_delay seconds have passed, then hands the whole group to
+flush(items), which must commit them together and return one result per item in order. If the group fails,
+each item is retried on its own so that only the offending one sees the error. A flush whose commit went
+through but whose follow-up work failed raises CommittedFlushError instead, so nothing is written twice.
+"""
+import queue
+import threading
+import time
+import traceback
+from concurrent.futures import Future
+
+STOP = object()
+
+
+class CommittedFlushError(Exception):
+    """Raised by flush when the group is committed but work after the commit failed; carries the results."""
+
+    def __init__(self, results: list):
+        super().__init__("group committed, but post-commit work failed")
+        self.results = results
+
+
+class GroupCommitter:
+    def __init__(self, flush, max_delay: float, max_items: int):
+        self.flush = flush
+        self.max_delay = max_delay
+        self.max_items = max_items
+        self.groups = 0
+        self.items = 0
+        self._queue = queue.Queue()
+        self._thread = None
+
+    def start(self):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="sales-group-commit", daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        """Flushes everything already submitted, then stops the background thread."""
+        if self._thread is not None:
+            self._queue.put(STOP)
+            self._thread.join()
+            self._thread = None
+
+    def submit(self, item) -> Future:
+        future = Future()
+        self._queue.put((item, future))
+        return future
+
+    def _collect(self, first) -> tuple:
+        group = [first]
+        deadline = time.monotonic() + self.max_delay
+        while len(group) < self.max_items:
+            timeout = deadline - time.monotonic()
+            if timeout <= 0:
+                break
+            try:
+                entry = self._queue.get(timeout=timeout)
+            except queue.Empty:
+                break
+            if entry is STOP:
+                return group, True
+            group.append(entry)
+        return group, False
+
+    def _run(self):
+        while True:
+            first = self._queue.get()
+            if first is STOP:
+                return
+            group, stopping = self._collect(first)
+            self._commit(group)
+            if stopping:
+                return
+
+    def _flush_one(self, item):
+        try:
+            return self.flush([item])[0]
+        except CommittedFlushError as e:
+            traceback.print_exception(e)
+            return e.results[0]
+
+    def _commit(self, group: list):
+        self.groups += 1
+        self.items += len(group)
+        try:
+            results = self.flush([item for item, _ in group])
+        except CommittedFlushError as e:
+            # The items are stored; failing them now would only invite the callers to send them again.
+            traceback.print_exception(e)
+            results = e.results
+        except Exception:
+            for item, future in group:
+                try:
+                    future.set_result(self._flush_one(item))
+                except Exception as e:
+                    future.set_exception(e)
+            return
+        for (_, future), result in zip(group, results):
+            future.set_result(result)
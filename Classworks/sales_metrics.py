@@ -0,0 +1,153 @@
+"""Minimal Prometheus-style metrics for SalesAnalyticsAPI, rendered in the text exposition format.
+
+A disabled registry hands out a shared no-op context manager from stage() and ignores observations, so the
+instrumentation left in the handlers costs a method call when metrics are switched off.
+"""
+import bisect
+import contextlib
+import threading
+import time
+
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+NULL_STAGE = contextlib.nullcontext()
+
+
+def format_labels(names: tuple, values: tuple, extra: str = "") -> str:
+    pairs = [f'{name}="{str(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+class Counter:
+    def __init__(self, name: str, help_text: str, label_names: tuple):
+        self.name = name
+        self.help_text = help_text
+        self.label_names = label_names
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def inc(self, labels: tuple, amount: float = 1):
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0) + amount
+
+    def render(self) -> list:
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} counter"]
+        with self._lock:
+            for labels, value in sorted(self._values.items()):
+                lines.append(f"{self.name}{format_labels(self.label_names, labels)} {value}")
+        return lines
+
+
+class Histogram:
+    def __init__(self, name: str, help_text: str, label_names: tuple, buckets: tuple = DEFAULT_BUCKETS):
+        self.name = name
+        self.help_text = help_text
+        self.label_names = label_names
+        self.buckets = buckets
+        self._series = {}
+        self._lock = threading.Lock()
+
+    def observe(self, labels: tuple, value: float):
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(labels)
+            if series is None:
+                series = self._series[labels] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            series[0][index] += 1
+            series[1] += value
+            series[2] += 1
+
+    def render(self) -> list:
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            for labels, (counts, total, count) in sorted(self._series.items()):
+                cumulative = 0
+                for bound, bucket_count in zip(self.buckets, counts):
+                    cumulative += bucket_count
+                    bucket_labels = format_labels(self.label_names, labels, 'le="%s"' % bound)
+                    lines.append(f"{self.name}_bucket{bucket_labels} {cumulative}")
+                bucket_labels = format_labels(self.label_names, labels, 'le="+Inf"')
+                lines.append(f"{self.name}_bucket{bucket_labels} {count}")
+                lines.append(f"{self.name}_sum{format_labels(self.label_names, labels)} {total}")
+                lines.append(f"{self.name}_count{format_labels(self.label_names, labels)} {count}")
+        return lines
+
+
+class MetricsRegistry:
+    def __init__(self, enabled: bool):
+        self.enabled = enabled
+        self.request_duration = Histogram(
+            "sales_http_request_duration_seconds", "HTTP request latency by route.", ("method", "route", "status")
+        )
+        self.stage_duration = Histogram(
+            "sales_analytics_stage_duration_seconds", "Time spent in each analytics pipeline stage.",
+            ("endpoint", "stage")
+        )
+        self.rows = Counter("sales_analytics_rows_total", "Aggregated rows read by analytics endpoints.",
+                            ("endpoint",))
+        self.bytes = Counter("sales_analytics_bytes_total", "Response bytes produced by analytics endpoints.",
+                             ("endpoint",))
+        self.collectors = []
+
+    @contextlib.contextmanager
+    def _timed_stage(self, endpoint: str, stage: str):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.stage_duration.observe((endpoint, stage), time.perf_counter() - started)
+
+    def stage(self, endpoint: str, stage: str):
+        if not self.enabled:
+            return NULL_STAGE
+        return self._timed_stage(endpoint, stage)
+
+    def observe_stage(self, endpoint: str, stage: str, seconds: float):
+        if self.enabled:
+            self.stage_duration.observe((endpoint, stage), seconds)
+
+    def count_rows(self, endpoint: str, rows: int):
+        if self.enabled:
+            self.rows.inc((endpoint,), rows)
+
+    def count_bytes(self, endpoint: str, size: int):
+        if self.enabled:
+            self.bytes.inc((endpoint,), size)
+
+    def render(self) -> str:
+        lines = []
+        for metric in (self.request_duration, self.stage_duration, self.rows, self.bytes):
+            lines.extend(metric.render())
+        for collect in self.collectors:
+            lines.extend(collect())
+        return "\n".join(lines) + "\n"
+
+
+class MetricsMiddleware:
+    """Pure ASGI middleware (no BaseHTTPMiddleware buffering) timing each request by its route template."""
+
+    def __init__(self, app, registry: MetricsRegistry):
+        self.app = app
+        self.registry = registry
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not self.registry.enabled:
+            await self.app(scope, receive, send)
+            return
+
+        started = time.perf_counter()
+        status = 500
+
+        async def send_with_status(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            route = scope.get("route")
+            path = getattr(route, "path", "unmatched")
+            self.registry.request_duration.observe((scope["method"], path, status), time.perf_counter() - started)
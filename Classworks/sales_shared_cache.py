@@ -0,0 +1,83 @@
+"""Cross-process data version and result cache for running SalesAnalyticsAPI with several uvicorn workers.
+
+Both live in one small SQLite file next to the sales database. Every committed write in any worker bumps the
+shared version; cached results are keyed by it, so a bump makes older entries unreachable in every process
+at once without sending any invalidation messages. Old entries are pruned oldest-first beyond max_entries.
+"""
+import sqlite3
+import threading
+import time
+
+
+class SharedCacheFile:
+    def __init__(self, path: str):
+        self.path = path
+        self._local = threading.local()
+        with self.connection() as conn:
+            conn.execute("CREATE TABLE IF NOT EXISTS data_version (id INTEGER PRIMARY KEY CHECK (id = 1), "
+                         "version INTEGER NOT NULL)")
+            conn.execute("INSERT OR IGNORE INTO data_version (id, version) VALUES (1, 0)")
+            conn.execute("CREATE TABLE IF NOT EXISTS results (key TEXT PRIMARY KEY, body BLOB NOT NULL, etag TEXT, "
+                         "stored_at REAL NOT NULL)")
+
+    def connection(self) -> sqlite3.Connection:
+        """One connection per thread, in autocommit-per-statement mode unless used as a context manager."""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+
+class SharedDataVersion:
+    """DataVersion whose counter is shared by every process using the same cache file."""
+
+    def __init__(self, cache_file: SharedCacheFile):
+        self.cache_file = cache_file
+
+    def current(self) -> int:
+        return self.cache_file.connection().execute("SELECT version FROM data_version WHERE id = 1").fetchone()[0]
+
+    def bump(self) -> int:
+        with self.cache_file.connection() as conn:
+            return conn.execute("UPDATE data_version SET version = version + 1 WHERE id = 1 "
+                                "RETURNING version").fetchone()[0]
+
+
+class SharedResultCache:
+    """PlotCache-compatible cache of (body bytes, etag) values stored in the shared cache file.
+
+    hits and misses are counted per process.
+    """
+
+    def __init__(self, cache_file: SharedCacheFile, max_entries: int):
+        self.cache_file = cache_file
+        self.max_size = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    def get(self, key: tuple):
+        row = self.cache_file.connection().execute("SELECT body, etag FROM results WHERE key = ?",
+                                                   (repr(key),)).fetchone()
+        with self._lock:
+            if row is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+        return bytes(row[0]), row[1]
+
+    def put(self, key: tuple, value: tuple):
+        body, etag = value
+        with self.cache_file.connection() as conn:
+            conn.execute("INSERT OR REPLACE INTO results (key, body, etag, stored_at) VALUES (?, ?, ?, ?)",
+                         (repr(key), body, etag, time.time()))
+            conn.execute("DELETE FROM results WHERE key NOT IN "
+                         "(SELECT key FROM results ORDER BY stored_at DESC LIMIT ?)", (self.max_size,))
+
+    def stats(self) -> dict:
+        size = self.cache_file.connection().execute("SELECT count(*) FROM results").fetchone()[0]
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses, "size": size, "max_size": self.max_size}
@@ -0,0 +1,10 @@
+import os
+import sys
+import tempfile
+
+# The Classworks modules are flat scripts rather than a package, so make them importable from the tests.
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+# SalesAnalyticsAPI resolves sales.db and sales_data.csv against the working directory when it is imported,
+# so import it from a scratch directory instead of next to the checked-in database.
+os.chdir(tempfile.mkdtemp(prefix="sales-tests-"))
@@ -0,0 +1,88 @@
+"""Checks that the rollup tables and the in-memory aggregate series stay equal to a GROUP BY over the sales
+table while sales are created, replaced, deleted and bulk-edited through the API.
+
+Run from the Classworks directory:
+    python -m pytest tests
+"""
+import os
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import func, select
+
+import SalesAnalyticsAPI as api
+
+SEED_CSV = """product,category,quantity,price,date
+Laptop,Electronics,1,999.99,2025-01-01
+Mouse,Electronics,3,24.99,2025-01-01
+Desk,Furniture,2,249.50,2025-01-02
+Pen,Stationery,10,1.25,2025-01-03
+Gift card,,1,20.00,2025-01-03
+"""
+
+
+@pytest.fixture
+def client():
+    # conftest.py runs the tests from a scratch directory, where the API keeps sales.db and sales_data.csv.
+    for name in ("sales.db", "sales.db-wal", "sales.db-shm"):
+        if os.path.exists(name):
+            os.remove(name)
+    with open(api.CSV_FILE, "w") as csv_file:
+        csv_file.write(SEED_CSV)
+    try:
+        with TestClient(api.app) as client:
+            yield client
+    finally:
+        for series in api.aggregate_series.values():
+            series.reset()
+        api.engine.dispose()
+
+
+def grouped(rows) -> list:
+    return sorted((key, round(revenue, 6), quantity, orders) for key, revenue, quantity, orders in rows)
+
+
+def assert_rollups_match_sales():
+    with api.SessionLocal() as db:
+        for model, key in api.ROLLUPS:
+            column = api.rollup_column(key)
+            expected = grouped(db.execute(
+                select(column, func.sum(api.SaleDB.quantity * api.SaleDB.price), func.sum(api.SaleDB.quantity),
+                       func.count(api.SaleDB.id)).where(column.isnot(None)).group_by(column)
+            ))
+            assert grouped(api.query_rollup_rows(db, key)) == expected, f"{model.__tablename__} drifted"
+            assert grouped(api.aggregate_series[key].rows()) == expected, f"{key} series drifted"
+        summary = api.compute_summary_sql(db)
+    assert summary == api.summary_from_rollup_rows(api.aggregate_series["category"].rows(),
+                                                   api.aggregate_series["scope"].rows())
+
+
+def test_rollups_and_series_follow_every_write(client):
+    assert_rollups_match_sales()
+    assert client.get("/analytics/summary").json()["total_revenue"] == pytest.approx(1606.46)
+
+    created = client.post("/sales/", json={"product": "Lamp", "category": "Furniture", "quantity": 2,
+                                           "price": 34.75, "date": "2025-01-04"}).json()
+    assert_rollups_match_sales()
+
+    response = client.put(f"/sales/{created['id']}", json={"product": "Lamp", "category": "Lighting",
+                                                            "quantity": 5, "price": 30.0, "date": "2025-01-01"})
+    assert response.status_code == 200
+    assert_rollups_match_sales()
+
+    response = client.patch("/sales/bulk", json={"category": "Electronics", "end": "2025-01-01",
+                                                 "changes": {"category": "Computers", "price": 10.0}})
+    assert response.json() == {"affected": 2}
+    assert_rollups_match_sales()
+
+    assert client.delete("/sales/1").status_code == 200
+    assert_rollups_match_sales()
+
+    response = client.request("DELETE", "/sales/bulk", json={"start": "2025-01-03"})
+    assert response.json() == {"affected": 2}
+    assert_rollups_match_sales()
+
+    response = client.request("DELETE", "/sales/bulk", json={"start": "2025-01-01"})
+    assert response.json() == {"affected": 3}
+    assert_rollups_match_sales()
+    assert client.get("/analytics/summary").json()["total_revenue"] == 0
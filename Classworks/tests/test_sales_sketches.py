@@ -0,0 +1,148 @@
+"""Checks the KLL and HyperLogLog sketches, and the /analytics/distribution figures built from them, against
+exact answers with fixed seeds and the error bounds documented in sales_sketches.
+
+Run from the Classworks directory:
+    python -m pytest tests
+"""
+import bisect
+import datetime
+import math
+import random
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from SalesAnalyticsAPI import Base, SaleDB, rebuild_sketches, get_analytics_distribution
+from sales_sketches import HLL_DEFAULT_PRECISION, KLLSketch, HyperLogLog
+
+QUANTILES = {"median_order_value": 0.5, "p90_order_value": 0.9, "p95_order_value": 0.95, "p99_order_value": 0.99}
+KLL_RANK_ERROR = 0.015
+# Three standard errors of 1.04 / sqrt(m), so a fixed-seed run is nowhere near the edge.
+HLL_RELATIVE_ERROR = 3 * 1.04 / math.sqrt(1 << HLL_DEFAULT_PRECISION)
+PRODUCTS = [
+    ("Laptop", "Electronics", 999.99),
+    ("Mouse", "Electronics", 24.99),
+    ("Desk", "Furniture", 249.50),
+    ("Chair", "Furniture", 129.00),
+    ("Notebook", "Stationery", 3.49),
+    ("Pen", "Stationery", 1.25),
+]
+
+
+def exact_quantile(values: list, fraction: float) -> float:
+    """The smallest value whose rank reaches fraction, the same definition KLLSketch.quantiles uses."""
+    return values[max(math.ceil(fraction * len(values)), 1) - 1]
+
+
+def test_kll_rank_error_of_merged_sketches():
+    random.seed(1)
+    rng = random.Random(1)
+    values = [rng.lognormvariate(3, 1) for _ in range(100_000)]
+    merged = KLLSketch()
+    for start in range(0, len(values), 2_000):
+        part = KLLSketch()
+        for value in values[start:start + 2_000]:
+            part.add(value)
+        merged.merge(part)
+
+    values.sort()
+    fractions = [0.01, 0.1, 0.25, 0.5, 0.75, 0.9, 0.95, 0.99]
+    assert merged.count == len(values)
+    for fraction, estimate in zip(fractions, merged.quantiles(fractions)):
+        assert abs(bisect.bisect_right(values, estimate) / len(values) - fraction) <= KLL_RANK_ERROR
+
+
+def test_kll_is_exact_below_k():
+    values = [float(value) for value in random.Random(2).sample(range(1_000), 150)]
+    sketch = KLLSketch()
+    for value in values:
+        sketch.add(value)
+    values.sort()
+    fractions = [0.0, 0.3, 0.5, 0.9, 1.0]
+    assert sketch.quantiles(fractions) == [exact_quantile(values, fraction) for fraction in fractions]
+
+
+def test_hll_relative_error():
+    sketch = HyperLogLog()
+    for i in range(100_000):
+        sketch.add(f"product-{i}")
+    assert abs(sketch.estimate() - 100_000) / 100_000 <= HLL_RELATIVE_ERROR
+
+
+def test_hll_is_exact_for_small_cardinalities():
+    sketch = HyperLogLog()
+    for i in range(100):
+        sketch.add(f"product-{i % 40}")
+    assert sketch.estimate() == 40
+
+
+def test_kll_serialize_and_merge_round_trip():
+    random.seed(3)
+    rng = random.Random(3)
+    first, second = KLLSketch(), KLLSketch()
+    for _ in range(5_000):
+        first.add(rng.random())
+        second.add(rng.random())
+
+    restored = KLLSketch.from_bytes(first.to_bytes())
+    assert (restored.k, restored.count, restored.levels) == (first.k, first.count, first.levels)
+    restored.merge(KLLSketch.from_bytes(second.to_bytes()))
+    assert restored.count == 10_000
+    assert KLLSketch.from_bytes(restored.to_bytes()).levels == restored.levels
+
+
+def test_hll_serialize_and_merge_round_trip():
+    few, many, both = HyperLogLog(), HyperLogLog(), HyperLogLog()
+    for i in range(3):
+        few.add(f"a{i}")
+        both.add(f"a{i}")
+    for i in range(50_000):
+        many.add(f"b{i}")
+        both.add(f"b{i}")
+
+    # A few products serialize sparsely, many densely; both decode to the same registers.
+    assert len(few.to_bytes()) < 20
+    assert len(many.to_bytes()) == 1 + (1 << HLL_DEFAULT_PRECISION)
+    for sketch in (few, many):
+        assert (HyperLogLog.from_bytes(sketch.to_bytes()).registers == sketch.registers).all()
+
+    merged = HyperLogLog.from_bytes(few.to_bytes())
+    merged.merge(HyperLogLog.from_bytes(many.to_bytes()))
+    assert (merged.registers == both.registers).all()
+
+
+def test_distribution_matches_exact_values_on_small_table(tmp_path):
+    # 150 orders stay below KLL's k, so the percentiles must be exact, and a handful of products per category
+    # stays in HyperLogLog's linear-counting range.
+    rng = random.Random(42)
+    sales = []
+    for _ in range(150):
+        product, category, price = rng.choice(PRODUCTS)
+        sales.append({"product": product, "category": category, "quantity": rng.randint(1, 10), "price": price,
+                      "date": datetime.date(2020, 1, 1) + datetime.timedelta(days=rng.randrange(60))})
+
+    engine = create_engine(f"sqlite:///{tmp_path / 'sketches.db'}")
+    Base.metadata.create_all(bind=engine)
+    with engine.begin() as conn:
+        conn.execute(SaleDB.__table__.insert(), sales)
+        rebuild_sketches(conn)
+
+    db = sessionmaker(bind=engine)()
+    try:
+        result = get_analytics_distribution(None, None, None, db)
+    finally:
+        db.close()
+        engine.dispose()
+
+    values = sorted(sale["quantity"] * sale["price"] for sale in sales)
+    assert result["orders"] == len(sales)
+    for name, fraction in QUANTILES.items():
+        assert result[name] == round(exact_quantile(values, fraction), 2)
+
+    exact_by_category = {}
+    for sale in sales:
+        exact_by_category.setdefault(sale["category"], set()).add(sale["product"])
+    assert result["distinct_products"] == len({sale["product"] for sale in sales})
+    assert result["distinct_products_by_category"] == {
+        category: len(products) for category, products in sorted(exact_by_category.items())
+    }
@@ -1,16 +1,27 @@
 import os
 import csv
 import random
+import threading
+import bisect
+import secrets
+import time
+from collections import OrderedDict
+from array import array
+from itertools import accumulate
 from typing import List, Optional
 
 from fastapi import Depends, FastAPI, HTTPException, status
 from pydantic import BaseModel
-from sqlalchemy import create_engine, Column, Integer, String, func
+from sqlalchemy import create_engine, Column, Integer, LargeBinary, String, cast, func, select, update
 from sqlalchemy.orm import sessionmaker, Session
 from sqlalchemy.ext.declarative import declarative_base
 
 DATABASE_URL = "sqlite:///./questions.db"
 DB_EXISTS = os.path.exists("questions.db")
+GAME_QUESTION_COUNT = 10
+GAME_SESSION_TTL_SECONDS = 30 * 60
+GAME_SESSION_LIMIT = 100_000
+MAX_ANSWER_BATCH = 100
 
 engine = create_engine(DATABASE_URL, connect_args={"check_same_thread": False})
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
@@ -50,13 +61,19 @@ class GameQuestion(BaseModel):
     class Config:
         orm_mode = True
 
+class GameSessionOut(BaseModel):
+    session_id: str
+    expires_in: int
+    questions: List[GameQuestion]
+
 class AnswerCheck(BaseModel):
-    question_id: int
+    session_id: str
     answer: str
+    question_index: Optional[int] = None
+    question_id: Optional[int] = None
 
-class PlayerCreate(BaseModel):
-    name: str
-    score: int
+class ScoreSubmit(BaseModel):
+    session_id: str
 
 class PlayerScore(BaseModel):
     name: str
@@ -65,6 +82,197 @@ class PlayerScore(BaseModel):
     class Config:
         orm_mode = True
 
+class PlayerRank(BaseModel):
+    name: str
+    score: int
+    rank: int
+    players: int
+
+class QuestionBank:
+    """Read-mostly in-memory copy of the questions table, so games and answer checks never query SQLite.
+
+    Ids sit in a sorted array('q') and the five fields of every question are stored UTF-8 encoded back to back
+    in one shared bytearray. Field j of row i spans offsets[FIELD_COUNT * i + j] to the next offset, so field
+    text can hold any character. That costs about the text itself plus 48 bytes per question, instead of six
+    Python objects per row. A game draws k distinct positions in O(k) rather than having SQLite shuffle the
+    whole table with ORDER BY RANDOM().
+    """
+    FIELD_COUNT = 5
+
+    def __init__(self):
+        self.ids = array("q")
+        self.offsets = array("q", [0])
+        self.data = bytearray()
+        self._lock = threading.Lock()
+
+    def _append(self, question_id: int, fields: tuple):
+        self.ids.append(question_id)
+        for field in fields:
+            self.data += field.encode("utf-8")
+            self.offsets.append(len(self.data))
+
+    def _fields(self, position: int) -> tuple:
+        start = self.FIELD_COUNT * position
+        bounds = self.offsets[start:start + self.FIELD_COUNT + 1]
+        return tuple(self.data[bounds[j]:bounds[j + 1]].decode("utf-8") for j in range(self.FIELD_COUNT))
+
+    def load(self, db: Session):
+        # SQLite concatenates the fields and reports each one's byte length, so the Python loop only encodes one
+        # string per question.
+        fields = [func.coalesce(column, "") for column in
+                  (Question.question_text, Question.option1, Question.option2, Question.option3, Question.option4)]
+        record = fields[0]
+        for field in fields[1:]:
+            record = record + field
+        lengths = [func.length(cast(field, LargeBinary)) for field in fields]
+        ids = array("q")
+        field_lengths = array("q")
+        encoded = []
+        for question_id, text, *row_lengths in db.execute(select(Question.id, record, *lengths).order_by(Question.id)):
+            ids.append(question_id)
+            field_lengths.extend(row_lengths)
+            encoded.append(text.encode("utf-8"))
+        offsets = array("q", accumulate(field_lengths, initial=0))
+        data = bytearray(b"".join(encoded))
+        with self._lock:
+            self.ids, self.offsets, self.data = ids, offsets, data
+
+    def add(self, question_id: int, fields: tuple):
+        with self._lock:
+            if not self.ids or question_id > self.ids[-1]:
+                self._append(question_id, fields)
+            else:
+                # SQLite can hand out a lower id after deletes; keep the arrays sorted by rebuilding around it.
+                rows = [(self.ids[i], self._fields(i)) for i in range(len(self.ids))]
+                bisect.insort(rows, (question_id, fields))
+                self.ids, self.offsets, self.data = array("q"), array("q", [0]), bytearray()
+                for row_id, row_fields in rows:
+                    self._append(row_id, row_fields)
+
+    def get(self, question_id: int) -> Optional[tuple]:
+        """(question_text, option1, option2, option3, option4) for question_id, or None; option1 is correct."""
+        with self._lock:
+            position = bisect.bisect_left(self.ids, question_id)
+            if position < len(self.ids) and self.ids[position] == question_id:
+                return self._fields(position)
+            return None
+
+    def sample(self, k: int) -> List[tuple]:
+        """k distinct (id, fields) pairs, or every question when there are fewer than k."""
+        with self._lock:
+            positions = random.sample(range(len(self.ids)), min(k, len(self.ids)))
+            return [(self.ids[position], self._fields(position)) for position in positions]
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def memory_bytes(self) -> int:
+        return (self.ids.itemsize * len(self.ids) + self.offsets.itemsize * len(self.offsets)
+                + len(self.data))
+
+class GameSession:
+    def __init__(self, username: str, question_ids: List[int], correct_answers: List[str]):
+        self.session_id = secrets.token_urlsafe(16)
+        self.username = username
+        self.question_ids = question_ids
+        self.correct_answers = correct_answers
+        self.answered = [False] * len(question_ids)
+        self.score = 0
+        self.expires_at = time.monotonic() + GAME_SESSION_TTL_SECONDS
+        self.lock = threading.Lock()
+
+class GameSessionStore:
+    """Games in progress by session id, dropped GAME_SESSION_TTL_SECONDS after they start.
+
+    Every session gets the same TTL, so insertion order is expiry order and eviction only ever pops from the
+    front. Past GAME_SESSION_LIMIT live sessions the oldest is dropped early.
+    """
+    def __init__(self):
+        self._sessions = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _evict(self):
+        now = time.monotonic()
+        while self._sessions:
+            oldest = next(iter(self._sessions.values()))
+            if oldest.expires_at > now and len(self._sessions) <= GAME_SESSION_LIMIT:
+                break
+            self._sessions.popitem(last=False)
+
+    def add(self, session: GameSession):
+        with self._lock:
+            self._sessions[session.session_id] = session
+            self._evict()
+
+    def get(self, session_id: str) -> Optional[GameSession]:
+        with self._lock:
+            self._evict()
+            return self._sessions.get(session_id)
+
+    def pop(self, session_id: str) -> Optional[GameSession]:
+        with self._lock:
+            self._evict()
+            return self._sessions.pop(session_id, None)
+
+    def __len__(self) -> int:
+        return len(self._sessions)
+
+class Leaderboard:
+    """Every player's best score, kept in memory so games, score submissions and leaderboard reads need no query.
+
+    entries is a list of (-score, name) sorted ascending, i.e. best first with ties by name, so the top n is a
+    slice and a player's rank is one bisect. Changing a score moves one entry, which shifts the list in C.
+    """
+    def __init__(self):
+        self.entries = []
+        self.scores = {}
+        self._lock = threading.Lock()
+
+    def load(self, rows):
+        scores = {name: score or 0 for name, score in rows}
+        entries = sorted((-score, name) for name, score in scores.items())
+        with self._lock:
+            self.scores, self.entries = scores, entries
+
+    def __contains__(self, name: str) -> bool:
+        return name in self.scores
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def add(self, name: str, score: int):
+        with self._lock:
+            if name not in self.scores:
+                self.scores[name] = score
+                bisect.insort(self.entries, (-score, name))
+
+    def raise_score(self, name: str, score: int) -> int:
+        """Records score if it beats name's best; returns the previous best."""
+        with self._lock:
+            previous = self.scores.get(name, 0)
+            if score > previous:
+                if name in self.scores:
+                    del self.entries[bisect.bisect_left(self.entries, (-previous, name))]
+                self.scores[name] = score
+                bisect.insort(self.entries, (-score, name))
+            return previous
+
+    def top(self, limit: int) -> List[tuple]:
+        with self._lock:
+            return [(name, -negative_score) for negative_score, name in self.entries[:max(limit, 0)]]
+
+    def rank(self, name: str) -> Optional[tuple]:
+        """(rank, score) for name, or None; players with the same score share a rank."""
+        with self._lock:
+            score = self.scores.get(name)
+            if score is None:
+                return None
+            return bisect.bisect_left(self.entries, (-score,)) + 1, score
+
+question_bank = QuestionBank()
+game_sessions = GameSessionStore()
+leaderboard = Leaderboard()
+
 app = FastAPI(
     title="Who Wants To Be A Millionare",
     description="An API for a simple quiz game using FastAPI and SQLite.",
@@ -108,15 +316,28 @@ def on_startup():
         finally:
             db.close()
 
-@app.post("/game", response_model=List[GameQuestion], summary="Start a new game")
+    db = SessionLocal()
+    try:
+        question_bank.load(db)
+        leaderboard.load(db.execute(select(Player.name, Player.score)))
+    finally:
+        db.close()
+    size_mib = question_bank.memory_bytes() / 2 ** 20
+    per_million = size_mib * 1_000_000 / len(question_bank) if len(question_bank) else 0
+    print(f"Question bank holds {len(question_bank)} questions in {size_mib:.2f} MiB "
+          f"({per_million:.0f} MiB per million questions).")
+
+@app.post("/game", response_model=GameSessionOut, summary="Start a new game")
 def start_game(payload: GameStart, db: Session = Depends(get_db)):
-    player = db.query(Player).filter(Player.name == payload.username).first()
-    if not player:
-        new_player = Player(name=payload.username, score=0)
-        db.add(new_player)
-        db.commit()
+    if payload.username not in leaderboard:
+        player = db.query(Player).filter(Player.name == payload.username).first()
+        if not player:
+            player = Player(name=payload.username, score=0)
+            db.add(player)
+            db.commit()
+        leaderboard.add(payload.username, player.score or 0)
 
-    random_questions = db.query(Question).order_by(func.random()).limit(10).all()
+    random_questions = question_bank.sample(GAME_QUESTION_COUNT)
 
     if not random_questions:
         raise HTTPException(
@@ -125,13 +346,16 @@ def start_game(payload: GameStart, db: Session = Depends(get_db)):
         )
 
     game_questions = []
-    for q in random_questions:
-        answers = [q.option1, q.option2, q.option3, q.option4]
+    for question_id, (question_text, *answers) in random_questions:
         random.shuffle(answers)
         game_questions.append(
-            GameQuestion(id=q.id, question_text=q.question_text, answers=answers)
+            GameQuestion(id=question_id, question_text=question_text, answers=answers)
         )
-    return game_questions
+    session = GameSession(payload.username, [question_id for question_id, _ in random_questions],
+                          [fields[1] for _, fields in random_questions])
+    game_sessions.add(session)
+    return GameSessionOut(session_id=session.session_id, expires_in=GAME_SESSION_TTL_SECONDS,
+                          questions=game_questions)
 
 
 @app.post("/add_question", status_code=status.HTTP_201_CREATED, summary="Add a new question")
@@ -146,44 +370,112 @@ def add_question(question: QuestionCreate, db: Session = Depends(get_db)):
     db.add(new_question)
     db.commit()
     db.refresh(new_question)
+    question_bank.add(new_question.id, (question.question_text, question.correct_answer, question.wrong_answer_1,
+                                        question.wrong_answer_2, question.wrong_answer_3))
     return {"message": "Question added successfully!", "question_id": new_question.id}
 
 
-@app.post("/check_answer", summary="Check an answer")
-def check_answer(payload: AnswerCheck, db: Session = Depends(get_db)):
-    question = db.query(Question).filter(Question.id == payload.question_id).first()
+def get_game_session(session_id: str) -> GameSession:
+    session = game_sessions.get(session_id)
+    if session is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Game session not found or expired. Start a new game."
+        )
+    return session
+
 
-    if not question:
+def check_session_answer(session: GameSession, payload: AnswerCheck) -> dict:
+    index = payload.question_index
+    if index is None and payload.question_id in session.question_ids:
+        index = session.question_ids.index(payload.question_id)
+    if index is None or not 0 <= index < len(session.question_ids):
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
-            detail=f"Question with ID {payload.question_id} not found."
+            detail="Question is not part of this game."
         )
+    correct_answer = session.correct_answers[index]
+    is_correct = (correct_answer == payload.answer)
+    with session.lock:
+        if session.answered[index]:
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail=f"Question {index} of this game has already been answered."
+            )
+        session.answered[index] = True
+        if is_correct:
+            session.score += 1
+        return {"correct": is_correct, "correct_answer": correct_answer, "score": session.score}
 
-    is_correct = (question.option1 == payload.answer)
-    return {"correct": is_correct, "correct_answer": question.option1}
 
+@app.post("/check_answer", summary="Check an answer")
+def check_answer(payload: AnswerCheck):
+    # Answers are only checked within the game they were drawn for, so a client cannot look up a question's
+    # correct answer before answering it.
+    return check_session_answer(get_game_session(payload.session_id), payload)
+
+
+@app.post("/check_answers", summary="Check several answers at once")
+def check_answers(payloads: List[AnswerCheck]):
+    if len(payloads) > MAX_ANSWER_BATCH:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"At most {MAX_ANSWER_BATCH} answers can be checked at once."
+        )
+
+    session_ids = {payload.session_id for payload in payloads}
+    if len(session_ids) > 1:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="All answers in a batch must belong to the same game session."
+        )
+    if not session_ids:
+        return {"results": [], "score": 0}
+    session = get_game_session(session_ids.pop())
+
+    # Every answer resolves against the game session, so the batch costs no queries. One bad entry is reported
+    # in its own result instead of failing the rest.
+    results = []
+    for payload in payloads:
+        try:
+            results.append(check_session_answer(session, payload))
+        except HTTPException as e:
+            results.append({"correct": False, "error": e.detail})
+    return {"results": results, "score": session.score}
 
-@app.post("/scores", status_code=status.HTTP_200_OK, summary="Submit a player's score")
-def submit_score(player: PlayerCreate, db: Session = Depends(get_db)):
-    existing_player = db.query(Player).filter(Player.name == player.name).first()
 
-    if not existing_player:
+@app.post("/scores", status_code=status.HTTP_200_OK, summary="Submit a player's score")
+def submit_score(payload: ScoreSubmit, db: Session = Depends(get_db)):
+    # The score comes from the server-side session, which ends here so it can only be submitted once.
+    session = game_sessions.pop(payload.session_id)
+    if session is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
-            detail=f"Player '{player.name}' not found. A game must be started with a username before submitting a score."
+            detail="Game session not found or expired. Start a new game."
         )
 
-    if player.score > existing_player.score:
-        existing_player.score = player.score
+    name, score = session.username, session.score
+    current = leaderboard.raise_score(name, score)
+    if score > current:
+        db.execute(update(Player).where(Player.name == name, Player.score < score).values(score=score))
         db.commit()
-        db.refresh(existing_player)
-        return {"message": f"New high score for {player.name} ({player.score}) has been recorded."}
+        return {"message": f"New high score for {name} ({score}) has been recorded."}
 
-    return {"message": f"Your score ({player.score}) was not higher than your current high score ({existing_player.score})."}
+    return {"message": f"Your score ({score}) was not higher than your current high score ({current})."}
 
 
 @app.get("/leaderboard", response_model=List[PlayerScore], summary="Get top player scores")
-def get_leaderboard(limit: int = 10, db: Session = Depends(get_db)):
-    top_players = db.query(Player).order_by(Player.score.desc()).limit(limit).all()
-    return top_players
+def get_leaderboard(limit: int = 10):
+    return [PlayerScore(name=name, score=score) for name, score in leaderboard.top(limit)]
+
+
+@app.get("/leaderboard/rank/{name}", response_model=PlayerRank, summary="Get one player's leaderboard rank")
+def get_player_rank(name: str):
+    rank = leaderboard.rank(name)
+    if rank is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Player '{name}' not found."
+        )
+    return PlayerRank(name=name, score=rank[1], rank=rank[0], players=len(leaderboard))
 
@@ -0,0 +1,77 @@
+"""Compares ORDER BY RANDOM() LIMIT 10 with drawing a game from the in-memory QuestionBank across bank sizes.
+
+Each size gets a fresh SQLite file with that many synthetic questions; the bank's load time and memory are
+reported too. Run from the game directory:
+    python benchmarks/bench_sampling.py --max-exponent 7
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+from sqlalchemy import create_engine, func, insert
+from sqlalchemy.orm import sessionmaker
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from MillionareGameAPI import GAME_QUESTION_COUNT, Base, Question, QuestionBank
+
+
+def seed(engine, rows: int, batch_size: int = 100_000):
+    with engine.begin() as conn:
+        for offset in range(0, rows, batch_size):
+            conn.execute(insert(Question), [
+                {"question_text": f"Question {i}?", "option1": f"right {i}", "option2": "wrong a",
+                 "option3": "wrong b", "option4": "wrong c"}
+                for i in range(offset, min(offset + batch_size, rows))
+            ])
+
+
+def best_of(fn, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--min-exponent", type=int, default=3)
+    parser.add_argument("--max-exponent", type=int, default=6)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    print(f"{'questions':>10} {'ORDER BY RANDOM() ms':>21} {'bank ms':>8} {'speedup':>8} {'load ms':>8} "
+          f"{'MiB per million':>16}")
+    for exponent in range(args.min_exponent, args.max_exponent + 1):
+        rows = 10 ** exponent
+        with tempfile.TemporaryDirectory() as tmp:
+            engine = create_engine(f"sqlite:///{os.path.join(tmp, 'questions.db')}")
+            Base.metadata.create_all(bind=engine)
+            seed(engine, rows)
+            db = sessionmaker(bind=engine)()
+
+            def order_by_random():
+                return db.query(Question).order_by(func.random()).limit(GAME_QUESTION_COUNT).all()
+
+            bank = QuestionBank()
+            load_time = best_of(lambda: bank.load(db), 1)
+
+            def sampled():
+                return bank.sample(GAME_QUESTION_COUNT)
+
+            assert len(sampled()) == GAME_QUESTION_COUNT
+            old = best_of(order_by_random, args.repeat)
+            new = best_of(sampled, args.repeat)
+            per_million = bank.memory_bytes() / 2 ** 20 * 1_000_000 / rows
+            print(f"{rows:>10} {old * 1000:>21.2f} {new * 1000:>8.3f} {old / new:>7.0f}x {load_time * 1000:>8.0f} "
+                  f"{per_million:>16.1f}")
+            db.close()
+            engine.dispose()
+
+
+if __name__ == "__main__":
+    main()